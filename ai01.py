@@ -1,10 +1,48 @@
 
+import os
 import sys
+import re
+import gc
+import hashlib
+import heapq
+import json
+import mmap
+import struct
 import random
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
-from PyQt6.QtCore import Qt, QSize, QSortFilterProxyModel, QRegularExpression, pyqtSignal
-from PyQt6.QtGui import QAction, QIcon, QStandardItem, QStandardItemModel, QRegularExpressionValidator
+import argparse
+import array
+import contextlib
+import itertools
+import sqlite3
+import uuid
+import weakref
+import threading
+import time
+import tracemalloc
+from dataclasses import MISSING, dataclass, fields
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import MutableSequence, Sequence
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from PyQt6.QtCore import (
+    Qt,
+    QSize,
+    QAbstractTableModel,
+    QModelIndex,
+    QRegularExpression,
+    QObject,
+    QEvent,
+    QThread,
+    QThreadPool,
+    QRunnable,
+    QTimer,
+    QStandardPaths,
+    pyqtSignal,
+)
+from PyQt6 import sip
+from PyQt6.QtGui import (
+    QAction, QIcon, QImage, QImageReader, QPixmap, QStandardItem, QStandardItemModel, QRegularExpressionValidator,
+)
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -24,6 +62,7 @@ from PyQt6.QtWidgets import (
     QDialogButtonBox,
     QMessageBox,
     QComboBox,
+    QSlider,
     QSpinBox,
     QDoubleSpinBox,
     QFrame,
@@ -32,30 +71,132 @@ from PyQt6.QtWidgets import (
     QStyle,
     QSplitter,
     QGraphicsDropShadowEffect,
+    QCheckBox,
+    QProgressDialog,
+    QFileDialog,
 )
 # Matplotlib embedding
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
+from matplotlib.ticker import AutoLocator, MaxNLocator
 
 # ----------- Theme Manager ------------------------------------
+class _ShowEventFilter(QObject):
+    """Tells a SubscriberRegistry when a widget it deferred is shown"""
+    def __init__(self, registry: "SubscriberRegistry"):
+        super().__init__()
+        self.registry = registry
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Show:
+            self.registry.flush_widget(obj)
+        return False
+
+class SubscriberRegistry:
+    """Change callbacks held by weak reference, so subscribing never keeps a widget alive.
+
+    Bound methods are held with WeakMethod and dropped once their object is
+    collected or its Qt object deleted; plain functions are held strongly,
+    since nothing else would keep a lambda alive. With defer_hidden, a
+    callback bound to a hidden widget only marks it dirty; it is called with
+    the latest value when the widget is next shown.
+    """
+    def __init__(self, latest: Callable[[], Any], defer_hidden: bool = False):
+        self.latest = latest
+        self.defer_hidden = defer_hidden
+        self._callbacks: List[Callable[[], Optional[Callable]]] = []
+        self._dirty: "weakref.WeakKeyDictionary[QWidget, List[Callable]]" = weakref.WeakKeyDictionary()
+        self._show_filter: Optional[_ShowEventFilter] = None
+
+    def add(self, callback: Callable):
+        if hasattr(callback, "__self__"):
+            self._callbacks.append(weakref.WeakMethod(callback))
+        else:
+            self._callbacks.append(lambda: callback)
+
+    def __len__(self) -> int:
+        return len(self._live())
+
+    def _live(self) -> List[Callable]:
+        live, refs = [], []
+        for ref in self._callbacks:
+            callback = ref()
+            owner = getattr(callback, "__self__", None)
+            if callback is None or (isinstance(owner, QObject) and sip.isdeleted(owner)):
+                continue
+            live.append(callback)
+            refs.append(ref)
+        self._callbacks = refs
+        return live
+
+    def notify(self, value: Any):
+        for callback in self._live():
+            owner = getattr(callback, "__self__", None)
+            if self.defer_hidden and isinstance(owner, QWidget) and not owner.isVisible():
+                self._defer(owner, callback)
+            else:
+                callback(value)
+
+    def _defer(self, widget: QWidget, callback: Callable):
+        pending = self._dirty.get(widget)
+        if pending is None:
+            if self._show_filter is None:
+                self._show_filter = _ShowEventFilter(self)
+            widget.installEventFilter(self._show_filter)
+            pending = self._dirty[widget] = []
+        ref = weakref.WeakMethod(callback)
+        if ref not in pending:
+            pending.append(ref)
+
+    def flush_widget(self, widget: QObject):
+        """Run the updates a widget missed while it was hidden"""
+        pending = self._dirty.pop(widget, None)
+        if pending is None:
+            return
+        widget.removeEventFilter(self._show_filter)
+        for ref in pending:
+            callback = ref()
+            if callback is not None:
+                callback(self.latest())
+
 class ThemeManager:
     LIGHT = "light"
     DARK = "dark"
+    NOTIFY_DELAY_MS = 80  # quiet period before subscribers restyle
     
     def __init__(self):
         self.current_theme = self.LIGHT
-        self._subscribers = []
+        self._notified_theme = self.LIGHT
+        self._notify_timer: Optional[QTimer] = None  # created once there is an event loop
+        self._subscribers = SubscriberRegistry(self.get_theme, defer_hidden=True)
     
     def subscribe(self, callback):
-        """Subscribe to theme changes"""
-        self._subscribers.append(callback)
+        """Subscribe to theme changes (held weakly; hidden widgets update when shown)"""
+        self._subscribers.add(callback)
     
     def set_theme(self, theme: str):
-        """Set the current theme and notify subscribers"""
+        """Set the current theme and notify subscribers.
+
+        Notification is debounced: each change restarts a short timer, so a
+        burst of toggles produces one update with the final theme.
+        """
         if theme in [self.LIGHT, self.DARK]:
             self.current_theme = theme
-            for callback in self._subscribers:
-                callback(theme)
+            if QApplication.instance() is None:
+                self._notify()
+                return
+            if self._notify_timer is None:
+                self._notify_timer = QTimer()
+                self._notify_timer.setSingleShot(True)
+                self._notify_timer.setInterval(self.NOTIFY_DELAY_MS)
+                self._notify_timer.timeout.connect(self._notify)
+            self._notify_timer.start()
+    
+    def _notify(self):
+        if self.current_theme == self._notified_theme:
+            return
+        self._notified_theme = self.current_theme
+        self._subscribers.notify(self.current_theme)
     
     def get_theme(self) -> str:
         return self.current_theme
@@ -373,6 +514,44 @@ class ThemeManager:
 # Global theme manager instance
 theme_manager = ThemeManager()
 
+# ----------- Render Profiles ----------------------------------
+@dataclass(frozen=True)
+class RenderProfile:
+    name: str
+    row_height: Optional[int]  # fixed row height in px, None for the style default
+    alternating_rows: bool
+    max_bar_annotations: int  # charts with more bars than this get no value labels
+    graphics_effects: bool
+    chart_dpi: int
+    lean_charts: bool  # fit chart layout once per redraw of the content, few ticks, no grid or antialiasing
+
+class RenderProfileManager:
+    """Holds the rendering profile picked in Settings > Density"""
+    COMFORTABLE = RenderProfile("Comfortable", None, True, 36, True, 100, False)
+    # Low-resource profile for slow counter PCs
+    COMPACT = RenderProfile("Compact", 24, False, 8, False, 72, True)
+
+    def __init__(self):
+        self.current_profile = self.COMFORTABLE
+        self._subscribers = SubscriberRegistry(self.get_profile)
+
+    def subscribe(self, callback):
+        """Subscribe to profile changes (held weakly)"""
+        self._subscribers.add(callback)
+
+    def set_profile(self, name: str):
+        """Set the current profile by name and notify subscribers"""
+        profile = {p.name: p for p in (self.COMFORTABLE, self.COMPACT)}.get(name)
+        if profile is not None and profile != self.current_profile:
+            self.current_profile = profile
+            self._subscribers.notify(profile)
+
+    def get_profile(self) -> RenderProfile:
+        return self.current_profile
+
+# Global render profile instance
+render_profiles = RenderProfileManager()
+
 # ----------- Data Models (simple in-memory stubs) --------------
 @dataclass
 class Product:
@@ -380,6 +559,9 @@ class Product:
     brand: str
     price: float
     stock: int
+    id: int = 0  # 0 until the record has been saved
+    sku: str = ""  # barcode / stock-keeping unit, unique when set
+    image: str = ""  # path of the product photo, if any
 
 @dataclass
 class Customer:
@@ -387,8 +569,2399 @@ class Customer:
     phone: str
     email: str
     total_purchases: int
+    id: int = 0
+
+@dataclass
+class Sale:
+    day: int  # days since 1970-01-01
+    product_id: int
+    customer_id: int
+    quantity: int
+    unit_price: float
+
+# ----------- Query Cache --------------------------------------
+class QueryCache:
+    """Size-bounded LRU of aggregate results shared by the pages.
+
+    Entries are keyed by (query, params) and remember the versions of the
+    tables the query read. A lookup after any of those tables was written
+    finds different versions and recomputes; writes to other tables leave
+    the entry alone.
+    """
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Any], Tuple[Tuple[int, ...], Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple[str, Any], versions: Tuple[int, ...], compute: Callable[[], Any]):
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.invalidations += 1
+        self.misses += 1
+        value = compute()
+        self.put(key, versions, value)
+        return value
+
+    def peek(self, key: Tuple[str, Any], versions: Tuple[int, ...]) -> Any:
+        """The cached result if it is current, else None; never computes"""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None and entry[0] == versions else None
+
+    def put(self, key: Tuple[str, Any], versions: Tuple[int, ...], value: Any):
+        """Store a result the caller brought up to date itself"""
+        self._entries[key] = (versions, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+# ----------- Columnar Store and Snapshots ---------------------
+_NUMPY_TYPES = {float: np.float64, int: np.int64}
+
+class StringColumn(Sequence):
+    """UTF-8 string column: an offsets array over a byte buffer.
+
+    Strings are decoded one at a time on access, so a column backed by a
+    memory-mapped snapshot costs nothing until rows are actually read.
+    Rewritten cells go to a small overlay instead of the buffer.
+    """
+    def __init__(self, offsets: np.ndarray, data):
+        self.offsets = offsets
+        self.data = data
+        self.edits: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        edited = self.edits.get(i)
+        if edited is not None:
+            return edited
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return bytes(self.data[start:end]).decode("utf-8")
+
+    def __setitem__(self, i: int, value: str):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("string column index out of range")
+        self.edits[i] = value
+
+    def copy(self) -> "StringColumn":
+        """A column over the same buffers with its own overlay"""
+        column = StringColumn(self.offsets, self.data)
+        column.edits = dict(self.edits)
+        return column
+
+    def to_numpy(self) -> np.ndarray:
+        """Gather the column into a fixed-width bytes array in one vectorized pass"""
+        starts = np.asarray(self.offsets[:-1])
+        lengths = np.diff(self.offsets)
+        width = int(lengths.max()) if len(lengths) else 0
+        if width == 0:
+            values = np.zeros(len(lengths), dtype="S1")
+        else:
+            mask = np.arange(width) < lengths[:, None]
+            chars = np.zeros((len(lengths), width), dtype=np.uint8)
+            blob = np.frombuffer(self.data, dtype=np.uint8)
+            chars[mask] = blob[(starts[:, None] + np.arange(width))[mask]]
+            values = chars.view(f"S{width}").ravel()
+        if self.edits:
+            rows = np.fromiter(self.edits, dtype=np.int64, count=len(self.edits))
+            patch = np.array([v.encode("utf-8") for v in self.edits.values()])
+            if patch.itemsize > values.itemsize:
+                values = values.astype(patch.dtype)
+            values[rows] = patch
+        return values
+
+_TABLE_VERSIONS = itertools.count(1)
+
+class HashIndex:
+    """Unique index from a text column's values to record ids.
+
+    Its RecordTable reports every insert, replace and delete, so a lookup
+    stays one dict probe however the table changes. Empty values are not
+    indexed.
+    """
+    def __init__(self, table: "RecordTable", field: str):
+        self.field = field
+        self._ids = dict(zip(table.array(field).tolist(), np.asarray(table.column("id")).tolist()))
+        self._ids.pop(b"", None)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get(self, value: str) -> Optional[int]:
+        """Id of the record holding value, or None"""
+        return self._ids.get(value.encode("utf-8"))
+
+    def add(self, value: str, record_id: int):
+        if value:
+            self._ids[value.encode("utf-8")] = record_id
+
+    def discard(self, value: str, record_id: int):
+        key = value.encode("utf-8")
+        if self._ids.get(key) == record_id:
+            del self._ids[key]
+
+
+class RecordTable(MutableSequence):
+    """Columnar storage for a dataclass record type.
+
+    Numeric fields live in NumPy arrays and text fields in lists (or
+    StringColumns when mapped from a snapshot). Records are materialized
+    only when indexed; `version` changes on every mutation and is never
+    shared by two tables, so a replaced table never looks unchanged.
+    `field_versions` does the same per column, for results that read only
+    some of them.
+    """
+    def __init__(self, record_type: type, columns: Dict[str, Any]):
+        self.record_type = record_type
+        self.fields = [f.name for f in fields(record_type)]
+        self.columns = columns
+        self.version = next(_TABLE_VERSIONS)
+        self.field_versions = dict.fromkeys(self.fields, self.version)
+        self.indexes: Dict[str, HashIndex] = {}
+        self._spare: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_records(cls, record_type: type, records) -> "RecordTable":
+        if isinstance(records, RecordTable):
+            return records
+        records = list(records)
+        columns: Dict[str, Any] = {}
+        for f in fields(record_type):
+            values = [getattr(r, f.name) for r in records]
+            dtype = _NUMPY_TYPES.get(f.type)
+            columns[f.name] = np.array(values, dtype=dtype) if dtype else values
+        return cls(record_type, columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[self.fields[0]])
+
+    def value(self, row: int, field: str):
+        v = self.columns[field][row]
+        return v.item() if isinstance(v, np.generic) else v
+
+    def column(self, field: str):
+        return self.columns[field]
+
+    def array(self, field: str) -> np.ndarray:
+        """The column as a NumPy array (text columns come back as bytes)"""
+        col = self.columns[field]
+        if isinstance(col, np.ndarray):
+            return col
+        if isinstance(col, StringColumn):
+            return col.to_numpy()
+        return np.array([v.encode("utf-8") for v in col]) if col else np.zeros(0, dtype="S1")
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if not -len(self) <= i < len(self):
+            raise IndexError("record index out of range")
+        return self.record_type(**{f: self.value(i, f) for f in self.fields})
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _mutable(self, field: str):
+        col = self.columns[field]
+        if isinstance(col, np.ndarray):
+            if not col.flags.writeable:
+                col = col.copy()
+        elif not isinstance(col, list):
+            col = list(col)
+        self.columns[field] = col
+        return col
+
+    def hash_index(self, field: str) -> HashIndex:
+        """The table's index on field, built on first use"""
+        index = self.indexes.get(field)
+        if index is None:
+            index = self.indexes[field] = HashIndex(self, field)
+        return index
+
+    def _unindex(self, i: int):
+        for index in self.indexes.values():
+            index.discard(self.value(i, index.field), self.value(i, "id"))
+
+    def _index(self, record):
+        for index in self.indexes.values():
+            index.add(getattr(record, index.field), record.id)
+
+    def __setitem__(self, i: int, record):
+        # Only the changed cells are written, so editing one row keeps
+        # mapped string columns mapped
+        changed = [f for f in self.fields if self.value(i, f) != getattr(record, f)]
+        if not changed:
+            return
+        self._unindex(i)
+        for f in changed:
+            col = self.columns[f]
+            if isinstance(col, StringColumn):
+                col[i] = getattr(record, f)
+            else:
+                self._mutable(f)[i] = getattr(record, f)
+        self._index(record)
+        self.touch(changed)
+
+    def __delitem__(self, i):
+        for row in (range(*i.indices(len(self))) if isinstance(i, slice) else [i]):
+            self._unindex(row)
+        for f in self.fields:
+            col = self._mutable(f)
+            if isinstance(col, np.ndarray):
+                self.columns[f] = np.delete(col, i)
+            else:
+                del col[i]
+        self.touch()
+
+    def _tail(self, field: str, n: int) -> np.ndarray:
+        """Backing array for a numeric column with room for row n.
+
+        The column is kept as a prefix view of a larger array, so appends
+        write into spare capacity and reallocate only when it runs out.
+        """
+        col = self.columns[field]
+        buf = self._spare.get(field)
+        if buf is None or col.base is not buf or len(buf) <= n:
+            buf = np.empty(n + max(n // 8, 1024), dtype=col.dtype)
+            buf[:n] = col
+            self._spare[field] = buf
+        return buf
+
+    def insert(self, i: int, record):
+        if i == len(self):
+            self._append(record)
+            return
+        for f in self.fields:
+            col = self._mutable(f)
+            if isinstance(col, np.ndarray):
+                self.columns[f] = np.insert(col, i, getattr(record, f))
+            else:
+                col.insert(i, getattr(record, f))
+        self._index(record)
+        self.touch()
+
+    def _append(self, record):
+        n = len(self)
+        for f in self.fields:
+            col = self.columns[f]
+            if isinstance(col, np.ndarray):
+                buf = self._tail(f, n)
+                buf[n] = getattr(record, f)
+                self.columns[f] = buf[:n + 1]
+            else:
+                self._mutable(f).append(getattr(record, f))
+        self._index(record)
+        self.touch()
+
+    def set_values(self, rows: np.ndarray, field: str, values):
+        """Vectorized write of one column for many rows"""
+        self._mutable(field)[rows] = values
+        self.indexes.pop(field, None)  # rebuilt on next use
+        self.touch((field,))
+
+    def copy(self) -> "RecordTable":
+        """A table with its own columns, unaffected by later edits to this one"""
+        columns = {f: col.copy() for f, col in self.columns.items()}
+        return RecordTable(self.record_type, columns)
+
+    def touch(self, changed: Optional[Sequence[str]] = None):
+        """Mark the table (and the changed fields, all by default) as changed after an in-place update"""
+        self.version = next(_TABLE_VERSIONS)
+        for f in self.fields if changed is None else changed:
+            self.field_versions[f] = self.version
+
+    # Tables with an `id` field keep their rows in ascending id order, so a
+    # record is found by binary search instead of a separate index.
+    def find(self, record_id: int) -> Optional[int]:
+        """Row holding record_id, or None"""
+        ids = self.columns["id"]
+        row = int(np.searchsorted(ids, record_id))
+        return row if row < len(ids) and ids[row] == record_id else None
+
+    def insertion_point(self, record_id: int) -> int:
+        return int(np.searchsorted(self.columns["id"], record_id))
+
+    def rows_for_ids(self, record_ids: np.ndarray) -> np.ndarray:
+        """Vectorized find(); -1 where an id is not in the table"""
+        ids = self.columns["id"]
+        rows = np.searchsorted(ids, record_ids).clip(0, max(len(ids) - 1, 0))
+        found = (ids[rows] == record_ids) if len(ids) else np.zeros(len(record_ids), dtype=bool)
+        return np.where(found, rows, -1)
+
+    def next_id(self) -> int:
+        ids = self.columns["id"]
+        return int(ids[-1]) + 1 if len(ids) else 1
+
+class RecordRows(Sequence):
+    """Chosen rows of a record table, in the given order, as a read-only sequence"""
+    def __init__(self, table: RecordTable, rows: np.ndarray):
+        self.table = table
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        return self.table[int(self.rows[i])]
+
+    def value(self, i: int, field: str):
+        return self.table.value(int(self.rows[i]), field)
+
+def _encode_column(col) -> Tuple[str, List[bytes]]:
+    """Return (kind, buffers) for one column of a snapshot"""
+    if isinstance(col, np.ndarray):
+        arr = np.ascontiguousarray(col)
+        return arr.dtype.str, [arr.tobytes()]
+    if isinstance(col, StringColumn) and not col.edits:
+        base = int(col.offsets[0])
+        offsets = np.asarray(col.offsets, dtype="<i8") - base
+        return "str", [offsets.tobytes(), bytes(col.data[base:int(col.offsets[-1])])]
+    encoded = [s.encode("utf-8") for s in col]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return "str", [offsets.tobytes(), b"".join(encoded)]
+
+def _default_column(f, count: int):
+    """A column of `count` copies of a field's default value"""
+    if f.type is str:
+        return [f.default] * count
+    return np.full(count, f.default, dtype=_NUMPY_TYPES[f.type])
+
+class ShopStore:
+    """Products, customers and chart rollups shared by the pages.
+
+    A store is either built in memory (pages seed it when empty) or opened
+    from a binary snapshot that is memory-mapped and paged in lazily.
+    """
+    SNAPSHOT_MAGIC = b"MSHOPSNP"
+    SNAPSHOT_VERSION = 2  # 2: products gained sku and image
+    TABLES = {"products": Product, "customers": Customer, "sales": Sale}
+
+    def __init__(self):
+        self._products: Optional[RecordTable] = None
+        self._customers: Optional[RecordTable] = None
+        self._sales: Optional[RecordTable] = None
+        self.monthly_sales: Optional[List[int]] = None
+        self.brand_units: Optional[Dict[str, int]] = None
+        self.forecast: Optional["DemandForecast"] = None
+        self.date_range: Optional[Tuple[int, int]] = None  # inclusive days; None means all time
+        self.meta: Dict[str, Any] = {}
+        self.cache = QueryCache()
+        self.db: Optional["ShopDatabase"] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self.mapped_path: Optional[str] = None  # snapshot file the columns are mapped from
+        self._rollup_version = 0
+
+    @staticmethod
+    def _with_ids(table: RecordTable) -> RecordTable:
+        """Number freshly seeded records that do not have ids yet"""
+        ids = table.columns["id"]
+        if len(ids) and not ids.any():
+            table.columns["id"] = np.arange(1, len(ids) + 1, dtype=np.int64)
+        return table
+
+    @property
+    def products(self) -> Optional[RecordTable]:
+        return self._products
+
+    @products.setter
+    def products(self, records):
+        self._products = None if records is None else self._with_ids(RecordTable.from_records(Product, records))
+        self._rollup_version += 1
+
+    @property
+    def customers(self) -> Optional[RecordTable]:
+        return self._customers
+
+    @customers.setter
+    def customers(self, records):
+        self._customers = None if records is None else self._with_ids(RecordTable.from_records(Customer, records))
+        self._rollup_version += 1
+
+    @property
+    def sales(self) -> Optional[RecordTable]:
+        return self._sales
+
+    @sales.setter
+    def sales(self, records):
+        self._sales = None if records is None else RecordTable.from_records(Sale, records)
+        self._rollup_version += 1
+
+    def table(self, name: str) -> RecordTable:
+        return getattr(self, name)
+
+    def table_version(self, name: str) -> int:
+        """Version of a table, or of one of its columns given as table.field"""
+        name, _, field = name.partition(".")
+        table = self.table(name)
+        if table is None:
+            return 0
+        return table.field_versions[field] if field else table.version
+
+    def versions(self, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self.table_version(t) for t in tables)
+
+    def query(self, name: str, tables: Tuple[str, ...], compute: Callable[[], Any], params: Any = ()):
+        """Cached result of compute(), reused until one of `tables` is written"""
+        return self.cache.get((name, params), self.versions(tables), compute)
+
+    def find_sku(self, sku: str) -> Optional[int]:
+        """Row of the product with this SKU: a hash probe, then a binary search on id"""
+        if self.products is None or not sku:
+            return None
+        product_id = self.products.hash_index("sku").get(sku)
+        return None if product_id is None else self.products.find(product_id)
+
+    def leaderboards(self) -> "Leaderboards":
+        # Keyed on sales only: stock and price edits must not rebuild the
+        # boards, and a sale is credited to its brand when it is recorded.
+        return self.query("leaderboards", ("sales",), lambda: Leaderboards.from_store(self))
+
+    def record_sale(self, sale: Sale):
+        """Append a sale and fold it into the leaderboards and range sums instead of rebuilding them"""
+        boards = self.leaderboards()
+        sums = self.cache.peek(("prefix_sums", ()), self.versions(self.SALES_ANALYTICS))
+        if self.sales is None:
+            self.sales = [sale]
+        else:
+            self.sales.append(sale)
+        row = None if self.products is None else self.products.find(sale.product_id)
+        if row is not None:
+            boards.add_sale(sale, self.products.value(row, "brand"))
+        self.cache.put(("leaderboards", ()), self.versions(("sales",)), boards)
+        # A sale dated before the last day would land mid-history; the sums
+        # are then rebuilt on next use
+        if sums is not None and sums.add_sale(sale, -1 if row is None else row, self.sales):
+            self.cache.put(("prefix_sums", ()), self.versions(self.SALES_ANALYTICS), sums)
+
+    # Range analytics read the sales plus each product's id and brand, so
+    # stock and price edits leave them alone
+    SALES_ANALYTICS = ("sales", "products.id", "products.brand")
+
+    def prefix_sums(self) -> Optional["SalesPrefixSums"]:
+        """Running daily totals behind the date-range charts, when there is a sales history"""
+        if self.sales is None or not len(self.sales) or self.products is None:
+            return None
+        return self.query("prefix_sums", self.SALES_ANALYTICS, lambda: SalesPrefixSums(self))
+
+    def rollups(self) -> Tuple[List[int], Dict[str, int]]:
+        """Monthly and per-brand units, from the sales history when there is one"""
+        if self.sales is None:
+            return self.monthly_sales, self.brand_units
+
+        def compute():
+            sums = self.prefix_sums()
+            return sales_rollups(self) if sums is None else sums.rollups()
+        return self.query("sales_rollups", self.SALES_ANALYTICS, compute)
+
+    def transaction(self):
+        """Group several writes into one database transaction"""
+        return self.db.transaction() if self.db is not None else contextlib.nullcontext()
+
+    def add(self, name: str, record):
+        """Save a new record and give it an id; the caller appends it to the table"""
+        if self.db is not None:
+            record.id = self.db.insert(name, record)
+        else:
+            record.id = self.table(name).next_id()
+        return record
+
+    def save(self, name: str, record):
+        """Persist an edited record"""
+        if self.db is not None:
+            self.db.update(name, record)
+
+    def remove(self, name: str, record_id: int):
+        """Delete a record from the database; the caller removes its row"""
+        if self.db is not None:
+            self.db.delete(name, record_id)
+
+    def bulk_update(self, name: str, rows: np.ndarray, field: str, values: np.ndarray):
+        """Write one column for many rows: one database transaction, one table update"""
+        table = self.table(name)
+        if self.db is not None:
+            self.db.update_column(name, field, np.asarray(table.column("id"))[rows], values)
+        table.set_values(rows, field, values)
+
+    def adjust_column(self, name: str, rows: np.ndarray, field: str, expression: str, value) -> np.ndarray:
+        """Apply a relative change in the database and load the results; returns the rows that changed"""
+        table = self.table(name)
+        ids = np.asarray(table.column("id"))[rows]
+        found = self.db.adjust_column(name, field, ids, expression, value)
+        present = np.fromiter((i in found for i in ids.tolist()), dtype=bool, count=len(ids))
+        rows, ids = rows[present], ids[present]  # rows deleted elsewhere go away on the next sync
+        column = np.asarray(table.column(field))
+        values = np.array([found[i] for i in ids.tolist()], dtype=column.dtype)
+        changed = column[rows] != values
+        rows, values = rows[changed], values[changed]
+        if len(rows):
+            table.set_values(rows, field, values)
+        return rows
+
+    def sell(self, row: int, quantity: int = 1, customer_id: int = 0) -> Tuple[bool, Optional[int]]:
+        """Take quantity of a product off its stock and record the sale.
+
+        Returns (sold, stock now); stock is None if another terminal deleted
+        the product. The local stock is set to the database's value either way.
+        """
+        products = self.products
+        product_id = products.value(row, "id")
+        if self.db is not None:
+            sold, stock = self.db.take_stock(product_id, quantity)
+        else:
+            stock = products.value(row, "stock")
+            sold = stock >= quantity
+            stock = stock - quantity if sold else stock
+        if stock is not None and stock != products.value(row, "stock"):
+            # Only the stock cell changes, so the text columns stay mapped
+            products.set_values(np.array([row]), "stock", np.array([stock]))
+        if sold:
+            today = int(np.datetime64("today", "D").astype(np.int64))
+            self.record_sale(Sale(today, product_id, customer_id, quantity, products.value(row, "price")))
+        return sold, stock
+
+    def apply_changes(self, name: str, changes: Dict[int, Any], sink=None) -> int:
+        """Apply {id: record or None} changes pulled from the database.
+
+        Rows are updated through sink (a RecordTableModel, so views get
+        targeted insert/remove/dataChanged signals) or directly on the table.
+        Returns how many rows actually changed.
+        """
+        table = self.table(name)
+        sink = sink or _TableSink(table)
+        changed = 0
+        for record_id in sorted(changes):
+            record = changes[record_id]
+            row = table.find(record_id)
+            if record is None:
+                if row is not None:
+                    sink.remove_record(row)
+                    changed += 1
+            elif row is None:
+                sink.insert_record(table.insertion_point(record_id), record)
+                changed += 1
+            elif table[row] != record:
+                sink.replace_record(row, record)
+                changed += 1
+        return changed
+
+    def set_rollups(self, monthly_sales: List[int], brand_units: Dict[str, int]):
+        self.monthly_sales = list(monthly_sales)
+        self.brand_units = dict(brand_units)
+        self._rollup_version += 1
+
+    @property
+    def is_mapped(self) -> bool:
+        return self._mmap is not None
+
+    @property
+    def version(self) -> int:
+        """Changes whenever anything that goes into a snapshot changes"""
+        tables = (self._products, self._customers, self._sales)
+        return self._rollup_version + sum(t.version for t in tables if t is not None)
+
+    # Snapshot layout (little-endian): magic, u32 format version, u32 header
+    # length, JSON header, then 8-byte aligned column buffers whose offsets
+    # are recorded in the header relative to the start of the data section.
+    def snapshot_payload(self) -> Dict[str, Any]:
+        """Freeze what a snapshot needs so it can be written off the GUI thread.
+
+        Numeric columns are handed over as they are, copy-on-write: columns
+        mapped from the current snapshot are read-only already, and the rest
+        are made read-only, so the table copies one before its next in-place
+        write (appends go to spare room past the shared rows). Only list
+        text columns are copied.
+        """
+        tables = {}
+        for name in self.TABLES:
+            table = getattr(self, name)
+            if table is not None:
+                tables[name] = {f: self._frozen(col) for f, col in table.columns.items()}
+        monthly_sales, brand_units = self.monthly_sales, self.brand_units
+        if self.sales is not None:
+            # Only what is cached: a snapshot saved without rollups recomputes them when opened
+            versions = self.versions(self.SALES_ANALYTICS)
+            sums = self.cache.peek(("prefix_sums", ()), versions)
+            monthly_sales, brand_units = self.cache.peek(("sales_rollups", ()), versions) or \
+                (sums.rollups() if sums is not None else (None, None))
+        return {
+            "tables": tables,
+            "rollups": {"monthly_sales": monthly_sales, "brand_units": brand_units},
+            "meta": dict(self.meta),
+        }
+
+    @staticmethod
+    def _frozen(col):
+        """A column as of now, sharing the data wherever it cannot change under the writer"""
+        if isinstance(col, np.ndarray):
+            col.flags.writeable = False  # RecordTable._mutable copies it before writing
+            return col
+        if isinstance(col, StringColumn):
+            return col.copy()  # shares the mapped buffers, copies only the overlay
+        return list(col)
+
+    @staticmethod
+    def snapshot_files(path: str) -> List[str]:
+        """Files holding the snapshot at path, newest first.
+
+        Windows will not replace a memory-mapped file, so a save that would
+        overwrite the mapped snapshot goes to a sibling file instead.
+        """
+        files = [p for p in (path, f"{path}.alt") if os.path.exists(p)]
+        return sorted(files, key=lambda p: os.stat(p).st_mtime_ns, reverse=True)
+
+    @classmethod
+    def write_snapshot(cls, payload: Dict[str, Any], path: str, mapped: Optional[str] = None):
+        """Write a snapshot for path, never over `mapped`, the file currently mapped"""
+        header: Dict[str, Any] = {"tables": {}, "rollups": payload["rollups"], "meta": payload["meta"]}
+        blocks: List[bytes] = []
+        offset = 0
+        for name, columns in payload["tables"].items():
+            spec = header["tables"][name] = {"columns": {}}
+            for field, col in columns.items():
+                kind, buffers = _encode_column(col)
+                entry = {"kind": kind, "buffers": []}
+                for buf in buffers:
+                    entry["buffers"].append([offset, len(buf)])
+                    blocks.append(buf)
+                    pad = -len(buf) % 8
+                    if pad:
+                        blocks.append(b"\0" * pad)
+                    offset += len(buf) + pad
+                spec["columns"][field] = entry
+        raw_header = json.dumps(header).encode("utf-8")
+        prefix = cls.SNAPSHOT_MAGIC + struct.pack("<II", cls.SNAPSHOT_VERSION, len(raw_header)) + raw_header
+        prefix += b"\0" * (-len(prefix) % 8)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        mapped = os.path.abspath(mapped) if mapped else None
+        target, other = path, f"{path}.alt"
+        if os.path.abspath(target) == mapped:
+            target, other = other, target
+        tmp_path = f"{target}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(prefix)
+            for block in blocks:
+                f.write(block)
+        os.replace(tmp_path, target)
+        if os.path.abspath(other) != mapped and os.path.exists(other):
+            with contextlib.suppress(OSError):
+                os.remove(other)
+
+    def save_snapshot(self, path: str):
+        self.write_snapshot(self.snapshot_payload(), path, self.mapped_path)
+
+    @classmethod
+    def open_snapshot(cls, path: str) -> "ShopStore":
+        """Map a snapshot file; columns are views into the mapping"""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = mm[:8]
+        version, header_len = struct.unpack_from("<II", mm, 8)
+        if magic != cls.SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a snapshot")
+        if not 1 <= version <= cls.SNAPSHOT_VERSION:
+            raise ValueError(f"{path} has snapshot format {version}; this version reads 1 to {cls.SNAPSHOT_VERSION}")
+        header = json.loads(mm[16:16 + header_len].decode("utf-8"))
+        data_start = 16 + header_len + (-(16 + header_len) % 8)
+        view = memoryview(mm)
+        store = cls()
+        for name, spec in header["tables"].items():
+            record_type = cls.TABLES[name]
+            columns: Dict[str, Any] = {}
+            for field, entry in spec["columns"].items():
+                bufs = [view[data_start + off:data_start + off + size] for off, size in entry["buffers"]]
+                if entry["kind"] == "str":
+                    columns[field] = StringColumn(np.frombuffer(bufs[0], dtype="<i8"), bufs[1])
+                else:
+                    columns[field] = np.frombuffer(bufs[0], dtype=entry["kind"])
+            if version < cls.SNAPSHOT_VERSION:
+                # Fields added since the snapshot was written start at their defaults
+                count = len(next(iter(columns.values())))
+                for f in fields(record_type):
+                    if f.name not in columns and f.default is not MISSING:
+                        columns[f.name] = _default_column(f, count)
+            if set(columns) != {f.name for f in fields(record_type)}:
+                raise ValueError(f"snapshot columns for {name} do not match this version")
+            setattr(store, f"_{name}", RecordTable(record_type, columns))
+        rollups = header.get("rollups") or {}
+        store.monthly_sales = rollups.get("monthly_sales")
+        store.brand_units = rollups.get("brand_units")
+        if store.sales is not None and store.monthly_sales is not None:
+            # The saved rollups match the saved sales, so a warm start does not rescan them
+            store.query("sales_rollups", store.SALES_ANALYTICS, lambda: (store.monthly_sales, store.brand_units))
+        store.meta = header.get("meta") or {}
+        store._mmap = mm
+        store.mapped_path = path
+        return store
+
+    @classmethod
+    def open(cls, path: Optional[str]) -> "ShopStore":
+        """Open the newest readable snapshot for path, or return an empty store if there is none"""
+        for candidate in cls.snapshot_files(path) if path else []:
+            try:
+                return cls.open_snapshot(candidate)
+            except (OSError, ValueError, KeyError, struct.error) as exc:
+                print(f"Ignoring unreadable snapshot {candidate}: {exc}", file=sys.stderr)
+        return cls()
+
+class _TableSink:
+    """Applies row changes straight to a RecordTable (no view attached)"""
+    def __init__(self, table: RecordTable):
+        self.table = table
+
+    def insert_record(self, row: int, record):
+        self.table.insert(row, record)
+
+    def replace_record(self, row: int, record):
+        self.table[row] = record
+
+    def remove_record(self, row: int):
+        del self.table[row]
+
+def default_snapshot_path() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppLocalDataLocation)
+    return os.path.join(base or os.path.expanduser("~"), "snapshot.bin")
+
+# ----------- Shared Database ----------------------------------
+class ShopDatabase:
+    """SQLite file shared by every admin terminal.
+
+    Triggers append each insert/update/delete to change_log, so any writer
+    is picked up. Terminals check PRAGMA data_version (which only moves when
+    another connection commits) and then pull just the change_log entries
+    past their watermark, re-reading only the rows those entries name.
+    """
+    TABLES = {"products": Product, "customers": Customer}
+    LOG_RETENTION = 100_000
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL, brand TEXT NOT NULL, price REAL NOT NULL, stock INTEGER NOT NULL,
+            sku TEXT NOT NULL DEFAULT '', image TEXT NOT NULL DEFAULT ''
+        );
+        CREATE TABLE IF NOT EXISTS customers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL, phone TEXT NOT NULL, email TEXT NOT NULL, total_purchases INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tbl TEXT NOT NULL, row_id INTEGER NOT NULL, op TEXT NOT NULL
+        );
+    """
+    TRIGGER = """
+        CREATE TRIGGER IF NOT EXISTS {table}_{name} AFTER {event} ON {table}
+        BEGIN INSERT INTO change_log (tbl, row_id, op) VALUES ('{table}', {ref}.id, '{op}'); END;
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Autocommit mode; transaction() issues BEGIN/COMMIT itself
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self._depth = 0
+        with self.transaction():
+            for statement in self.SCHEMA.split(";"):
+                if statement.strip():
+                    self.conn.execute(statement)
+            self._migrate()
+            for table in self.TABLES:
+                for name, event, ref, op in (("ai", "INSERT", "NEW", "I"), ("au", "UPDATE", "NEW", "U"), ("ad", "DELETE", "OLD", "D")):
+                    self.conn.execute(self.TRIGGER.format(table=table, name=name, event=event, ref=ref, op=op))
+            self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('id', ?)", (uuid.uuid4().hex,))
+        self.database_id = self.conn.execute("SELECT value FROM meta WHERE key = 'id'").fetchone()[0]
+        self.watermark = 0
+        self.needs_seed = True  # until attach() finds rows
+        self._data_version = self.data_version()
+
+    def _migrate(self):
+        """Bring a database created by an older version up to the current schema"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(products)")}
+        for column in ("sku", "image"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE products ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+        # Two terminals cannot hand out the same barcode
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS products_sku ON products (sku) WHERE sku != ''")
+
+    @contextlib.contextmanager
+    def transaction(self, write: bool = True):
+        """BEGIN ... COMMIT; nested calls join the outer transaction"""
+        if self._depth == 0:
+            self.conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        self._depth += 1
+        try:
+            yield self.conn
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self.conn.execute("ROLLBACK")
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self.conn.execute("COMMIT")
+
+    @staticmethod
+    def fields(name: str) -> List[str]:
+        return [f.name for f in fields(ShopDatabase.TABLES[name]) if f.name != "id"]
+
+    def data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def max_seq(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+    def is_empty(self) -> bool:
+        return not any(self.conn.execute(f"SELECT 1 FROM {t} LIMIT 1").fetchone() for t in self.TABLES)
+
+    def can_catch_up(self, database_id: Optional[str], watermark: Optional[int]) -> bool:
+        """Whether a snapshot taken at watermark can be brought current from change_log"""
+        if database_id != self.database_id or watermark is None:
+            return False
+        oldest = self.conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+        return watermark <= self.max_seq() and (oldest is None or oldest <= watermark + 1)
+
+    def load_table(self, name: str) -> RecordTable:
+        names = ["id"] + self.fields(name)
+        rows = self.conn.execute(f"SELECT {', '.join(names)} FROM {name} ORDER BY id").fetchall()
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        columns: Dict[str, Any] = {}
+        for field, col in zip(names, values):
+            dtype = _NUMPY_TYPES.get(next(f.type for f in fields(self.TABLES[name]) if f.name == field))
+            columns[field] = np.array(col, dtype=dtype) if dtype else list(col)
+        return RecordTable(self.TABLES[name], columns)
+
+    def attach(self, store: ShopStore):
+        """Make store current with the database and route its writes here.
+
+        A snapshot of this database is caught up from change_log; anything
+        else is replaced by a full load. An empty database is left for
+        populate() to fill from the store once the pages have seeded it.
+        """
+        store.db = self
+        self.needs_seed = self.is_empty()
+        if self.needs_seed:
+            return
+        if (store.products is not None and store.customers is not None
+                and self.can_catch_up(store.meta.get("db_id"), store.meta.get("db_watermark"))):
+            self.watermark = store.meta["db_watermark"]
+            for name, changes in self.pull_changes().items():
+                store.apply_changes(name, changes)
+        else:
+            with self.transaction(write=False):
+                self._load(store)
+        self._remember(store)
+
+    def _load(self, store: ShopStore):
+        self.watermark = self.max_seq()
+        store.products = self.load_table("products")
+        store.customers = self.load_table("customers")
+
+    def populate(self, store: ShopStore) -> bool:
+        """Copy the store into an empty database (the first terminal seeds it).
+
+        Returns True if another terminal seeded it first, in which case the
+        store's tables were replaced with the database's.
+        """
+        if not self.needs_seed:
+            return False
+        self.needs_seed = False
+        with self.transaction():
+            # Checked under the write lock so two terminals never both seed
+            if not self.is_empty():
+                self._load(store)
+                self._remember(store)
+                return True
+            for name in self.TABLES:
+                table = store.table(name)
+                if table is None:
+                    continue
+                names = ["id"] + self.fields(name)
+                placeholders = ", ".join("?" * len(names))
+                self.conn.executemany(
+                    f"INSERT INTO {name} ({', '.join(names)}) VALUES ({placeholders})",
+                    ([getattr(r, f) for f in names] for r in table),
+                )
+            self.prune_log()
+            self.watermark = self.max_seq()
+        self._data_version = self.data_version()
+        self._remember(store)
+        return False
+
+    def prune_log(self):
+        """Keep the newest LOG_RETENTION change_log entries; writes only when there is something to drop"""
+        cutoff = self.max_seq() - self.LOG_RETENTION
+        oldest = self.conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+        if oldest is not None and oldest <= cutoff:
+            with self.transaction():
+                self.conn.execute("DELETE FROM change_log WHERE seq <= ?", (cutoff,))
+
+    def _remember(self, store: ShopStore):
+        store.meta["db_id"] = self.database_id
+        store.meta["db_watermark"] = self.watermark
+
+    def insert(self, name: str, record) -> int:
+        names = self.fields(name)
+        with self.transaction():
+            cursor = self.conn.execute(
+                f"INSERT INTO {name} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                [getattr(record, f) for f in names],
+            )
+        return cursor.lastrowid
+
+    def update(self, name: str, record):
+        names = self.fields(name)
+        with self.transaction():
+            self.conn.execute(
+                f"UPDATE {name} SET {', '.join(f'{f} = ?' for f in names)} WHERE id = ?",
+                [getattr(record, f) for f in names] + [record.id],
+            )
+
+    def update_column(self, name: str, field: str, ids: np.ndarray, values: np.ndarray):
+        """Set one column on many rows in a single transaction"""
+        if field not in self.fields(name):
+            raise ValueError(f"Unknown column {name}.{field}")
+        with self.transaction():
+            self.conn.executemany(
+                f"UPDATE {name} SET {field} = ? WHERE id = ?", zip(values.tolist(), ids.tolist())
+            )
+
+    def adjust_column(self, name: str, field: str, ids: np.ndarray, expression: str, value) -> Dict[int, Any]:
+        """Set one column to an SQL expression of its current value on many
+        rows, then read the results back, all in one transaction.
+
+        Returns {id: new value} for the rows that still exist.
+        """
+        if field not in self.fields(name):
+            raise ValueError(f"Unknown column {name}.{field}")
+        ids = ids.tolist()
+        found: Dict[int, Any] = {}
+        with self.transaction():
+            self.conn.executemany(
+                f"UPDATE {name} SET {field} = {expression} WHERE id = ?", ((value, i) for i in ids)
+            )
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                found.update(self.conn.execute(
+                    f"SELECT id, {field} FROM {name} WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                ))
+        return found
+
+    def take_stock(self, product_id: int, quantity: int) -> Tuple[bool, Optional[int]]:
+        """Take quantity off a product's stock in SQL, so concurrent sales on
+        other terminals are never overwritten.
+
+        Returns (whether it was taken, the stock now in the database); the
+        stock is None when the product no longer exists.
+        """
+        with self.transaction():
+            taken = self.conn.execute(
+                "UPDATE products SET stock = stock - ? WHERE id = ? AND stock >= ?", (quantity, product_id, quantity)
+            ).rowcount > 0
+            row = self.conn.execute("SELECT stock FROM products WHERE id = ?", (product_id,)).fetchone()
+        return taken, None if row is None else row[0]
+
+    def delete(self, name: str, record_id: int):
+        with self.transaction():
+            self.conn.execute(f"DELETE FROM {name} WHERE id = ?", (record_id,))
+
+    def has_external_changes(self) -> bool:
+        """Cheap check for commits by other connections since the last call"""
+        version = self.data_version()
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+
+    def pull_changes(self, store: Optional[ShopStore] = None) -> Dict[str, Dict[int, Any]]:
+        """Rows touched since the watermark as {table: {id: record or None}}"""
+        with self.transaction(write=False):
+            if self.can_catch_up(self.database_id, self.watermark):
+                changes = self._logged_changes()
+            else:
+                # Entries past the watermark were pruned before this terminal
+                # read them, so every row is compared instead
+                changes = self._all_changes(store)
+                self.watermark = self.max_seq()
+        if store is not None:
+            self._remember(store)
+        return changes
+
+    def _logged_changes(self) -> Dict[str, Dict[int, Any]]:
+        changes: Dict[str, Dict[int, Any]] = {name: {} for name in self.TABLES}
+        log = self.conn.execute(
+            "SELECT seq, tbl, row_id FROM change_log WHERE seq > ? ORDER BY seq", (self.watermark,)
+        ).fetchall()
+        if not log:
+            return changes
+        touched: Dict[str, set] = defaultdict(set)
+        for _, name, row_id in log:
+            if name in changes:
+                touched[name].add(row_id)
+        for name, ids in touched.items():
+            names = ["id"] + self.fields(name)
+            record_type = self.TABLES[name]
+            ids = sorted(ids)
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT {', '.join(names)} FROM {name} WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found = {row[0]: record_type(**dict(zip(names, row))) for row in rows}
+                for record_id in chunk:
+                    changes[name][record_id] = found.get(record_id)
+        self.watermark = log[-1][0]
+        return changes
+
+    def _all_changes(self, store: Optional[ShopStore]) -> Dict[str, Dict[int, Any]]:
+        """Every database row, plus a deletion for each row only the store still has"""
+        changes: Dict[str, Dict[int, Any]] = {}
+        for name, record_type in self.TABLES.items():
+            names = ["id"] + self.fields(name)
+            rows = self.conn.execute(f"SELECT {', '.join(names)} FROM {name} ORDER BY id")
+            changes[name] = {row[0]: record_type(**dict(zip(names, row))) for row in rows}
+            table = None if store is None else store.table(name)
+            if table is not None:
+                for record_id in np.asarray(table.column("id")).tolist():
+                    changes[name].setdefault(record_id, None)
+        return changes
+
+# ----------- Synthetic Data -----------------------------------
+def string_column(values: np.ndarray) -> StringColumn:
+    """Pack a NumPy array of ASCII strings into a StringColumn without a Python loop"""
+    raw = np.ascontiguousarray(values.astype("S"))
+    width = raw.dtype.itemsize
+    lengths = np.char.str_len(raw)
+    offsets = np.zeros(len(raw) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if width == 0:
+        return StringColumn(offsets, b"")
+    chars = raw.view(np.uint8).reshape(len(raw), width)
+    data = chars[np.arange(width) < lengths[:, None]].tobytes()
+    return StringColumn(offsets, data)
+
+def ean13(numbers: np.ndarray) -> np.ndarray:
+    """EAN-13 barcodes (as strings) for 12-digit numbers, check digit included"""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    total = np.zeros(len(numbers), dtype=np.int64)
+    rest = numbers.copy()
+    # Weights run 3, 1, 3, ... from the rightmost of the 12 digits
+    for position in range(12):
+        total += (rest % 10) * (3 if position % 2 == 0 else 1)
+        rest //= 10
+    return (numbers * 10 + (10 - total % 10) % 10).astype("U13")
+
+def _weighted_draw(rng: np.random.Generator, weights: np.ndarray, size: int) -> np.ndarray:
+    """Indices drawn with probability proportional to weights (inverse CDF)"""
+    cdf = np.cumsum(weights)
+    # Sorted keys make searchsorted cache friendly; shuffle to restore random order
+    keys = np.sort(rng.random(size) * cdf[-1])
+    picks = np.searchsorted(cdf, keys, side="right").clip(0, len(weights) - 1)
+    rng.shuffle(picks)
+    return picks
+
+class SyntheticDataGenerator:
+    """Seeded, vectorized generator of products, customers and sales history.
+
+    The same seed always produces the same data, so benchmarks built on it
+    are reproducible. brand_skew is the Zipf exponent of brand popularity and
+    seasonality the amplitude of the yearly demand cycle (0 = flat).
+    """
+    BRANDS = ["Apple", "Samsung", "Xiaomi", "Oppo", "Vivo", "Google", "OnePlus", "Motorola", "Nokia", "Realme"]
+    BRAND_PRICES = [999, 849, 399, 449, 379, 799, 699, 299, 249, 279]
+    LINES = ["", " Lite", " Plus", " Pro", " Pro Max", " Ultra", " Mini", " FE"]
+    FIRST_NAMES = ["Alex", "Taylor", "Jordan", "Morgan", "Sam", "Riley", "Casey", "Jamie", "Devin", "Avery",
+                   "Chris", "Pat", "Robin", "Drew", "Kai", "Noor", "Ari", "Lee", "Quinn", "Rowan"]
+    LAST_NAMES = ["Lee", "Kim", "Patel", "Singh", "Garcia", "Nguyen", "Brown", "Johnson", "Lopez", "Martinez",
+                  "Silva", "Khan", "Perera", "Fernando", "Smith", "Chen", "Wang", "Ali", "Costa", "Dubois"]
+
+    def __init__(self, seed: int = 0, brand_skew: float = 1.1, seasonality: float = 0.35,
+                 start_day: str = "2023-01-01", days: int = 3 * 365):
+        self.seed = seed
+        self.brand_skew = brand_skew
+        self.seasonality = seasonality
+        self.start_day = int(np.datetime64(start_day, "D").astype(np.int64))
+        self.days = days
+
+    def _rng(self, stream: int) -> np.random.Generator:
+        # One independent stream per table keeps each table stable when the
+        # sizes of the others change
+        return np.random.default_rng([self.seed, stream])
+
+    def brand_weights(self) -> np.ndarray:
+        ranks = np.arange(1, len(self.BRANDS) + 1, dtype=np.float64)
+        weights = ranks ** -self.brand_skew
+        return weights / weights.sum()
+
+    def products(self, count: int) -> RecordTable:
+        rng = self._rng(1)
+        brands = np.array(self.BRANDS)
+        brand = rng.choice(len(brands), size=count, p=self.brand_weights())
+        line = rng.integers(0, len(self.LINES), size=count)
+        models = np.char.add(" Model ", np.arange(1, 60).astype("U"))
+        model = rng.integers(0, len(models), size=count)
+        name = np.char.add(np.char.add(brands[brand], models[model]), np.array(self.LINES)[line])
+        base = np.array(self.BRAND_PRICES, dtype=np.float64)[brand]
+        price = np.round(base * rng.lognormal(0.0, 0.35, size=count) + line * 40, 0) - 0.01
+        stock = rng.integers(0, 250, size=count)
+        return RecordTable(Product, {
+            "name": string_column(name),
+            "brand": string_column(brands[brand]),
+            "price": np.maximum(price, 49.99),
+            "stock": stock.astype(np.int64),
+            "id": np.arange(1, count + 1, dtype=np.int64),
+            # In-store EAN range (prefix 200), numbered by product id
+            "sku": string_column(ean13(200_000_000_000 + np.arange(1, count + 1))),
+            "image": StringColumn(np.zeros(count + 1, dtype=np.int64), b""),
+        })
+
+    def customers(self, count: int) -> RecordTable:
+        rng = self._rng(2)
+        # Format small lookup tables once and gather from them per row
+        first_idx = rng.integers(0, len(self.FIRST_NAMES), size=count)
+        last_idx = rng.integers(0, len(self.LAST_NAMES), size=count)
+        first, last = np.array(self.FIRST_NAMES), np.array(self.LAST_NAMES)
+        name = np.char.add(np.char.add(first[first_idx], " "), last[last_idx])
+        prefixes = np.char.add(np.char.add("+1 ", np.arange(200, 1000).astype("U")), "-")
+        exchanges = np.char.add(np.arange(100, 1000).astype("U"), "-")
+        lines = np.char.zfill(np.arange(10000).astype("U"), 4)
+        phone = np.char.add(
+            np.char.add(prefixes[rng.integers(0, len(prefixes), size=count)],
+                        exchanges[rng.integers(0, len(exchanges), size=count)]),
+            lines[rng.integers(0, len(lines), size=count)],
+        )
+        local = np.char.add(np.char.add(np.char.lower(first)[first_idx], "."), np.char.lower(last)[last_idx])
+        email = np.char.add(np.char.add(local, np.arange(count).astype("U")), "@example.com")
+        return RecordTable(Customer, {
+            "name": string_column(name),
+            "phone": string_column(phone),
+            "email": string_column(email),
+            "total_purchases": np.zeros(count, dtype=np.int64),
+            "id": np.arange(1, count + 1, dtype=np.int64),
+        })
+
+    def daily_weights(self) -> np.ndarray:
+        """Relative demand per day: yearly cycle peaking in December, weekend lift, mild growth"""
+        day = np.arange(self.days) + self.start_day
+        day_of_year = (day - np.datetime64("1970-01-01", "D").astype(np.int64)) % 365.25
+        yearly = 1.0 + self.seasonality * np.cos(2 * np.pi * (day_of_year - 350) / 365.25)
+        weekday = (day + 3) % 7  # 1970-01-01 was a Thursday; 0 = Monday
+        weekly = np.where(weekday >= 5, 1.3, 1.0)
+        trend = np.linspace(1.0, 1.2, self.days)
+        weights = yearly * weekly * trend
+        return weights / weights.sum()
+
+    def sales(self, count: int, products: RecordTable, customers: RecordTable) -> RecordTable:
+        rng = self._rng(3)
+        n_products, n_customers = len(products), len(customers)
+        # Sales per day drawn at once, so the history comes out already sorted
+        per_day = rng.multinomial(count, self.daily_weights())
+        day = np.repeat(np.arange(self.days, dtype=np.int64) + self.start_day, per_day)
+        # Brand skew is already in the catalogue mix; add a long per-product tail
+        product_id = _weighted_draw(rng, rng.pareto(1.5, size=n_products) + 1.0, count)
+        customer_id = _weighted_draw(rng, rng.pareto(2.0, size=n_customers) + 1.0, count)
+        quantity = 1 + rng.poisson(0.25, size=count)
+        discount = 1.0 - rng.choice([0.0, 0.05, 0.1], size=count, p=[0.8, 0.15, 0.05])
+        unit_price = np.round(np.asarray(products.column("price"))[product_id] * discount, 2)
+        return RecordTable(Sale, {
+            "day": day.astype(np.int64),
+            "product_id": np.asarray(products.column("id"))[product_id],
+            "customer_id": np.asarray(customers.column("id"))[customer_id],
+            "quantity": quantity.astype(np.int64),
+            "unit_price": unit_price,
+        })
+
+    def generate(self, n_products: int, n_customers: int, n_sales: int, store: Optional[ShopStore] = None) -> ShopStore:
+        """Fill store (or a new one) with generated tables and matching rollups"""
+        store = store or ShopStore()
+        products = self.products(n_products)
+        customers = self.customers(n_customers)
+        sales = self.sales(n_sales, products, customers) if n_products and n_customers else None
+        if sales is not None:
+            customers.columns["total_purchases"] = np.bincount(
+                customers.rows_for_ids(sales.column("customer_id")),
+                weights=sales.column("quantity"), minlength=n_customers,
+            ).astype(np.int64)
+        store.products = products
+        store.customers = customers
+        store.sales = sales
+        store.set_rollups(*sales_rollups(store))
+        return store
+
+def sales_rollups(store: ShopStore) -> Tuple[List[int], Dict[str, int]]:
+    """Units sold per calendar month over the last year, and units per brand"""
+    sales = store.sales
+    if sales is None or not len(sales):
+        return [0] * 12, {}
+    day = np.asarray(sales.column("day"))
+    quantity = np.asarray(sales.column("quantity"))
+    recent = day > day.max() - 365
+    month = day[recent].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+    monthly = np.bincount(month, weights=quantity[recent], minlength=12).astype(np.int64)
+    brand_names, brand_codes = np.unique(store.products.array("brand"), return_inverse=True)
+    rows = store.products.rows_for_ids(np.asarray(sales.column("product_id")))
+    known = rows >= 0
+    per_product = np.bincount(rows[known], weights=quantity[known], minlength=len(store.products))
+    per_brand = np.bincount(brand_codes, weights=per_product, minlength=len(brand_names))
+    order = np.argsort(-per_brand)
+    return monthly.tolist(), {brand_names[i].decode("utf-8"): int(per_brand[i]) for i in order}
+
+def sales_totals(store: ShopStore) -> Tuple[float, int]:
+    """Revenue and order count over the whole sales history"""
+    sales = store.sales
+    if sales is None:
+        return 0.0, 0
+    revenue = np.dot(np.asarray(sales.column("quantity"), dtype=np.float64), np.asarray(sales.column("unit_price")))
+    return float(revenue), len(sales)
+
+# ----------- Range Analytics ----------------------------------
+class SalesPrefixSums:
+    """Running daily totals, so any date range is summed with two lookups.
+
+    Days count from the first sale, and cum[d] holds everything sold before
+    day d. A range is then cum[end + 1] - cum[start], however long it is.
+    Every brand gets its own running row. A dense products-by-days grid
+    would not fit in memory, so products get a running row per calendar
+    month instead. The partial months at either end of a range are added
+    from the sales themselves, which are kept in day order for that. A
+    product ranking therefore reads at most two months of sales. Sales
+    recorded on or after the last day extend the sums in place.
+    """
+    METRICS = ("units", "revenue")
+
+    def __init__(self, store: ShopStore):
+        sales, products = store.sales, store.products
+        day = np.asarray(sales.column("day"))
+        rows = products.rows_for_ids(np.asarray(sales.column("product_id")))
+        quantity = np.asarray(sales.column("quantity"))
+        unit_price = np.asarray(sales.column("unit_price"))
+        # In day order already, quantity and unit_price stay views of the sales columns
+        self.in_table_order = not (len(day) > 1 and (day[1:] < day[:-1]).any())
+        if not self.in_table_order:
+            order = np.argsort(day, kind="stable")
+            day, rows, quantity, unit_price = day[order], rows[order], quantity[order], unit_price[order]
+        self.rows = np.empty(len(rows) + len(rows) // 8 + 1024, dtype=np.int32)  # room for new sales
+        self.rows[:len(rows)] = rows
+        self.quantity, self.unit_price = quantity, unit_price
+        self.first_day, self.last_day = int(day[0]), int(day[-1])
+        self.span = span = self.last_day - self.first_day + 1
+        offset = day - self.first_day
+        units = quantity.astype(np.float64)
+        amounts = {"units": units, "revenue": units * unit_price}
+        self.totals = {metric: self._running(np.bincount(offset, weights=amount, minlength=span))
+                       for metric, amount in amounts.items()}
+        # Sales are in day order, so the running order count is where each day starts
+        self.totals["orders"] = self._running(np.bincount(offset, minlength=span))
+        self.day_starts = self.totals["orders"].astype(np.int64)
+        known = rows >= 0
+        rows, offset = rows[known], offset[known]
+        amounts = {metric: amount[known] for metric, amount in amounts.items()}
+        brand_names, brand_codes = np.unique(products.array("brand"), return_inverse=True)
+        self.brands = [name.decode("utf-8") for name in brand_names]
+        self.product_brands = brand_codes
+        cells = brand_codes[rows] * span + offset
+        self.brand_sums = {
+            metric: self._running(np.bincount(cells, weights=amount, minlength=len(brand_names) * span)
+                                  .reshape(len(brand_names), span))
+            for metric, amount in amounts.items()
+        }
+        self.product_ids = np.array(products.column("id"))
+        self.month_starts = self._month_starts()
+        month_count = len(self.month_starts) - 1
+        cells = rows * month_count + np.repeat(np.arange(month_count), np.diff(self.month_starts))[offset]
+        self.product_months = {
+            metric: self._running(np.bincount(cells, weights=amount, minlength=len(self.product_ids) * month_count)
+                                  .reshape(len(self.product_ids), month_count))
+            for metric, amount in amounts.items()
+        }
+
+    @staticmethod
+    def _running(values: np.ndarray) -> np.ndarray:
+        """Running totals along the last axis, with a leading zero"""
+        out = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,))
+        np.cumsum(values, axis=-1, out=out[..., 1:])
+        return out
+
+    def _month_starts(self) -> np.ndarray:
+        """Day offset where each calendar month of the history starts, plus the end"""
+        first_month = np.datetime64(self.first_day, "D").astype("datetime64[M]")
+        months = np.arange(first_month, np.datetime64(self.last_day, "D").astype("datetime64[M]") + 2)
+        return (months.astype("datetime64[D]").astype(np.int64) - self.first_day).clip(0, self.span)
+
+    @staticmethod
+    def _carry(running: np.ndarray, extra: int) -> np.ndarray:
+        """Running totals extended by `extra` positions that add nothing"""
+        return np.concatenate([running, np.repeat(running[..., -1:], extra, axis=-1)], axis=-1)
+
+    def add_sale(self, sale: Sale, row: int, sales: RecordTable) -> bool:
+        """Fold in a sale just appended to `sales` (row: its product's row, or -1).
+
+        Only the last running entries change. A sale on a later day first
+        carries the totals forward to it, which copies the day rows (and the
+        product months at a month change) once per day. Returns False for a
+        sale dated before the last day, which would need a rebuild.
+        """
+        if sale.day < self.last_day:
+            return False
+        count = int(self.day_starts[-1])
+        if sale.day > self.last_day:
+            extra = sale.day - self.last_day
+            self.last_day, self.span = sale.day, self.span + extra
+            self.totals = {metric: self._carry(running, extra) for metric, running in self.totals.items()}
+            self.day_starts = self._carry(self.day_starts, extra)
+            self.brand_sums = {metric: self._carry(grid, extra) for metric, grid in self.brand_sums.items()}
+            self.month_starts = self._month_starts()
+            new_months = len(self.month_starts) - self.product_months["units"].shape[1]
+            if new_months:
+                self.product_months = {metric: self._carry(grid, new_months)
+                                       for metric, grid in self.product_months.items()}
+        if self.in_table_order:
+            self.quantity, self.unit_price = np.asarray(sales.column("quantity")), np.asarray(sales.column("unit_price"))
+        else:
+            self.quantity = self._append(self.quantity, count, sale.quantity)
+            self.unit_price = self._append(self.unit_price, count, sale.unit_price)
+        self.rows = self._append(self.rows, count, row)
+        amounts = {"units": float(sale.quantity), "revenue": sale.quantity * sale.unit_price}
+        for metric, amount in amounts.items():
+            self.totals[metric][-1] += amount
+            if row >= 0:
+                self.brand_sums[metric][self.product_brands[row], -1] += amount
+                self.product_months[metric][row, -1] += amount
+        self.totals["orders"][-1] += 1
+        self.day_starts[-1] += 1
+        return True
+
+    @staticmethod
+    def _append(values: np.ndarray, n: int, value) -> np.ndarray:
+        """Write value at position n, growing the array with spare room when it is full"""
+        if len(values) <= n:
+            grown = np.empty(n + n // 8 + 1024, dtype=values.dtype)
+            grown[:n] = values[:n]
+            values = grown
+        values[n] = value
+        return values
+
+    def rollups(self) -> Tuple[List[int], Dict[str, int]]:
+        """Same as sales_rollups(), read from the running totals"""
+        months, units = self.monthly("units", self.last_day - 364, self.last_day)
+        monthly = np.bincount(months.astype(np.int64) % 12, weights=units, minlength=12)
+        per_brand = self.brand_sums["units"][:, -1]
+        order = np.argsort(-per_brand, kind="stable")
+        return monthly.astype(np.int64).tolist(), {self.brands[i]: int(per_brand[i]) for i in order}
+
+    def offsets(self, start: int, end: int) -> Tuple[int, int]:
+        """Running-total positions bounding the inclusive day range"""
+        lo = min(max(start - self.first_day, 0), self.span)
+        hi = min(max(end - self.first_day + 1, lo), self.span)
+        return lo, hi
+
+    def total(self, metric: str, start: int, end: int) -> float:
+        lo, hi = self.offsets(start, end)
+        running = self.totals[metric]
+        return float(running[hi] - running[lo])
+
+    def monthly(self, metric: str, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(first day of each calendar month, month total) across the range"""
+        first = np.datetime64(int(max(start, self.first_day)), "D").astype("datetime64[M]")
+        last = np.datetime64(int(max(min(end, self.last_day), start)), "D").astype("datetime64[M]")
+        months = np.arange(first, last + 1)
+        edges = np.append(months, last + 1).astype("datetime64[D]").astype(np.int64)
+        edges = np.clip(edges - self.first_day, *self.offsets(start, end))
+        return months, np.diff(self.totals[metric][edges])
+
+    def product_totals(self, metric: str, start: int, end: int) -> np.ndarray:
+        """Every product's total over the range, in product table order"""
+        lo, hi = self.offsets(start, end)
+        first_whole = int(np.searchsorted(self.month_starts, lo))
+        end_whole = int(np.searchsorted(self.month_starts, hi, side="right")) - 1
+        if end_whole > first_whole:
+            grid = self.product_months[metric]
+            values = grid[:, end_whole] - grid[:, first_whole]
+            edges = [(lo, self.month_starts[first_whole]), (self.month_starts[end_whole], hi)]
+        else:
+            values = np.zeros(len(self.product_ids))
+            edges = [(lo, hi)]
+        for edge_lo, edge_hi in edges:
+            sales = slice(self.day_starts[edge_lo], self.day_starts[edge_hi])
+            rows = self.rows[sales]
+            amount = self.quantity[sales].astype(np.float64)
+            if metric == "revenue":
+                amount *= self.unit_price[sales]
+            known = rows >= 0
+            values += np.bincount(rows[known], weights=amount[known], minlength=len(values))
+        return values
+
+    def top(self, dimension: str, metric: str, start: int, end: int, k: int) -> Tuple[List[Tuple[Any, float]], float]:
+        """(top k entries, total of everything else), like Leaderboards.top"""
+        if dimension == "brand":
+            lo, hi = self.offsets(start, end)
+            keys = self.brands
+            values = self.brand_sums[metric][:, hi] - self.brand_sums[metric][:, lo]
+        else:
+            keys = self.product_ids
+            values = self.product_totals(metric, start, end)
+        count = min(k, len(values))
+        if not count:
+            return [], 0.0
+        best = np.argpartition(-values, count - 1)[:count]
+        best = best[np.argsort(-values[best], kind="stable")]
+        best = best[values[best] > 0]
+        entries = [(keys[i] if dimension == "brand" else int(keys[i]), float(values[i])) for i in best]
+        other = float(values.sum()) - sum(value for _, value in entries)
+        return entries, max(other, 0.0)
+
+# ----------- Demand Forecasting -------------------------------
+class DemandForecast:
+    """Smoothed daily demand per product id, as of the last day of sales.
+
+    Days of cover and reorder quantities are derived from current stock on
+    demand, so stock edits never need a new forecast.
+    """
+    LEAD_TIME_DAYS = 7
+    REVIEW_DAYS = 14
+    SERVICE_Z = 1.65  # about 95% of lead times without a stock-out
+
+    def __init__(self, ids: np.ndarray, rate: np.ndarray, as_of: int):
+        self.ids = ids
+        self.rate = rate
+        self.as_of = as_of
+
+    def rates_for(self, product_ids: np.ndarray) -> np.ndarray:
+        """Daily demand for each product id; 0 for products with no history"""
+        rows = np.searchsorted(self.ids, product_ids).clip(0, max(len(self.ids) - 1, 0))
+        if not len(self.ids):
+            return np.zeros(len(product_ids))
+        return np.where(self.ids[rows] == product_ids, self.rate[rows], 0.0)
+
+    def rate_for(self, product_id: int) -> float:
+        return float(self.rates_for(np.array([product_id]))[0])
+
+    @staticmethod
+    def days_of_cover(stock, rate):
+        """Days until stock runs out at the forecast rate (inf without demand)"""
+        stock, rate = np.asarray(stock, dtype=np.float64), np.asarray(rate, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(rate > 0, stock / rate, np.inf)
+
+    @classmethod
+    def reorder_quantity(cls, stock, rate):
+        """Units to order now to cover lead time plus one review period.
+
+        Safety stock treats daily unit demand as Poisson, so its variance over
+        the lead time equals the expected demand.
+        """
+        stock, rate = np.asarray(stock, dtype=np.float64), np.asarray(rate, dtype=np.float64)
+        target = rate * (cls.LEAD_TIME_DAYS + cls.REVIEW_DAYS) + cls.SERVICE_Z * np.sqrt(rate * cls.LEAD_TIME_DAYS)
+        return np.ceil(np.maximum(target - stock, 0.0)).astype(np.int64)
+
+def forecast_demand(sales: RecordTable, products: RecordTable, method: str = "ewma",
+                    span_days: int = 28, as_of: Optional[int] = None) -> DemandForecast:
+    """Daily demand for every product in one pass over the sales history.
+
+    "sma" averages units over the last span_days days; "ewma" is exponential
+    smoothing with alpha = 2 / (span_days + 1). The smoothed value of a daily
+    series is a weighted sum of its days, so each sale is weighted by its age
+    and summed per product with a single bincount; no product x day matrix is
+    ever built.
+    """
+    ids = np.array(products.column("id"))
+    if sales is None or not len(sales) or not len(ids):
+        return DemandForecast(ids, np.zeros(len(ids)), 0 if as_of is None else as_of)
+    day = np.asarray(sales.column("day"))
+    as_of = int(day.max()) if as_of is None else as_of
+    age = as_of - day
+    if method == "sma":
+        horizon = span_days
+        weights = np.full(horizon, 1.0 / span_days)
+    elif method == "ewma":
+        alpha = 2.0 / (span_days + 1)
+        # Ages past the horizon would add less than 0.01% to the forecast
+        horizon = int(np.ceil(np.log(1e-4) / np.log(1.0 - alpha)))
+        weights = alpha * (1.0 - alpha) ** np.arange(horizon)
+    else:
+        raise ValueError(f"Unknown forecast method: {method}")
+    recent = (age >= 0) & (age < horizon)
+    # Search one copy of the ids, so a concurrent edit cannot misalign rows
+    product_id = np.asarray(sales.column("product_id"))[recent]
+    rows = np.searchsorted(ids, product_id).clip(0, len(ids) - 1)
+    known = ids[rows] == product_id
+    contribution = np.asarray(sales.column("quantity"))[recent][known] * weights[age[recent][known]]
+    rate = np.bincount(rows[known], weights=contribution, minlength=len(ids))
+    return DemandForecast(ids, rate, as_of)
+
+class ForecastWorker(QObject):
+    """Runs forecast_demand off the GUI thread"""
+    finished = pyqtSignal(object)
+
+    def __init__(self, store: "ShopStore"):
+        super().__init__()
+        self.sales = store.sales
+        self.products = store.products
+
+    def run(self):
+        self.finished.emit(forecast_demand(self.sales, self.products))
+
+# ----------- Fuzzy Customer Search ----------------------------
+_NON_DIGITS = re.compile(r"\D")
+
+def normalize_phone(phone: str) -> str:
+    """Strip a phone number down to its digits"""
+    return _NON_DIGITS.sub("", phone)
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance.
+
+    With max_distance set, gives up early and returns max_distance + 1 once
+    the distance is known to exceed it.
+    """
+    if a == b:
+        return 0
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a or not b:
+        return len(a) or len(b)
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if max_distance is not None and min(cur) > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    if max_distance is not None:
+        return min(prev[-1], max_distance + 1)
+    return prev[-1]
+
+def _trigrams(term: str) -> List[str]:
+    padded = f" {term} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+class FuzzyCustomerIndex:
+    """Trigram index over the distinct terms of the customer list.
+
+    Customers share most name words, so the index is built over the term
+    vocabulary (name words, email parts, phone digits) rather than over rows.
+    A query gathers candidate terms from the trigram postings, scores only
+    those with edit distance, and maps the surviving terms back to customer
+    ids. Ids, unlike rows, survive inserts and deletes, so single customers
+    are added and removed in place. Postings are int arrays, which the
+    garbage collector does not track, so a build in a worker thread does not
+    set off full collections that would stall the GUI.
+    """
+    MIN_SIMILARITY = 0.6
+    MAX_CANDIDATES = 300
+
+    def __init__(self):
+        self._terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        self._term_customers: List[array.array] = []
+        self._postings: Dict[str, array.array] = {}
+
+    def build(self, customers: RecordTable, should_cancel: Optional[Callable[[], bool]] = None,
+              chunk: int = 1000) -> bool:
+        """Index every customer of the table; False if cancelled part way"""
+        ids = np.asarray(customers.column("id")).tolist()
+        for start in range(0, len(ids), chunk):
+            if should_cancel is not None and should_cancel():
+                return False
+            columns = [customers.column(f)[start:start + chunk] for f in ("name", "phone", "email")]
+            for customer_id, name, phone, email in zip(ids[start:start + chunk], *columns):
+                for term in self._terms_of(name, phone, email):
+                    self._term_customers[self._term_id(term)].append(customer_id)
+            time.sleep(0)  # hand the GIL to the GUI thread between chunks
+        return True
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._terms.append(term)
+            self._term_ids[term] = term_id
+            self._term_customers.append(array.array("q"))
+            for gram in set(_trigrams(term)):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array.array("q")
+                posting.append(term_id)
+        return term_id
+
+    def add(self, customer: Customer):
+        for term in self.terms_for(customer):
+            self._term_customers[self._term_id(term)].append(customer.id)
+
+    def remove(self, customer: Customer):
+        """Forget a customer as it was indexed (pass the old record after an edit)"""
+        for term in self.terms_for(customer):
+            term_id = self._term_ids.get(term)
+            if term_id is not None and customer.id in self._term_customers[term_id]:
+                self._term_customers[term_id].remove(customer.id)
+
+    @classmethod
+    def terms_for(cls, customer: Customer) -> set:
+        return cls._terms_of(customer.name, customer.phone, customer.email)
+
+    @staticmethod
+    def _terms_of(name: str, phone: str, email: str) -> set:
+        terms = set(name.lower().split())
+        local, _, domain = email.lower().partition("@")
+        terms.update(t for t in local.replace("_", ".").replace("-", ".").split(".") if t)
+        if domain:
+            terms.add(domain)
+        digits = normalize_phone(phone)
+        if digits:
+            terms.add(digits)
+        return terms
+
+    @staticmethod
+    def query_terms(text: str) -> List[str]:
+        terms = []
+        for token in text.lower().replace("@", " ").replace(".", " ").split():
+            digits = normalize_phone(token)
+            terms.append(digits if len(digits) >= 3 and len(digits) >= len(token) // 2 else token)
+        return terms
+
+    def _term_similarity(self, query: str, term: str) -> float:
+        if query.isdigit() and term.isdigit():
+            # Phone numbers are matched as digit substrings
+            return 1.0 if query in term else 0.0
+        whole = 1.0 - edit_distance(query, term) / max(len(query), len(term))
+        if len(term) <= len(query):
+            return whole
+        # Partially typed words match on the prefix, ranked below whole words
+        prefix = 1.0 - edit_distance(query, term[:len(query)]) / len(query)
+        return max(whole, 0.9 * prefix)
+
+    def _candidates(self, query: str) -> List[int]:
+        if query.isdigit() and len(query) >= 3:
+            # Digits match as substrings, so a match holds every inner
+            # trigram of the query: intersect those postings, uncapped
+            grams = {query[i:i + 3] for i in range(len(query) - 2)}
+            postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+            found = set(postings[0])
+            for posting in postings[1:]:
+                found.intersection_update(posting)
+            return list(found)
+        counts = Counter()
+        for gram in set(_trigrams(query)):
+            for term_id in self._postings.get(gram, ()):
+                counts[term_id] += 1
+        ranked = counts.most_common()
+        if len(ranked) > self.MAX_CANDIDATES:
+            # Cut after MAX_CANDIDATES, but never inside a run of equal counts
+            floor = ranked[self.MAX_CANDIDATES - 1][1]
+            ranked = itertools.takewhile(lambda item: item[1] >= floor, ranked)
+        return [term_id for term_id, _ in ranked]
+
+    def _match_terms(self, query: str) -> List[Tuple[int, float]]:
+        matches = []
+        for term_id in self._candidates(query):
+            score = self._term_similarity(query, self._terms[term_id])
+            if score >= self.MIN_SIMILARITY:
+                matches.append((term_id, score))
+        return matches
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return (customer id, score) pairs ranked by relevance, best first; all of them unless limited"""
+        query_terms = self.query_terms(text)
+        if not query_terms:
+            return []
+        id_scores: Dict[int, float] = {}
+        for query in query_terms:
+            best: Dict[int, float] = {}
+            for term_id, score in self._match_terms(query):
+                for customer_id in self._term_customers[term_id]:
+                    if score > best.get(customer_id, 0.0):
+                        best[customer_id] = score
+            for customer_id, score in best.items():
+                id_scores[customer_id] = id_scores.get(customer_id, 0.0) + score
+        ranked = sorted(id_scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(customer_id, score / len(query_terms)) for customer_id, score in ranked[:limit]]
+
+# ----------- Duplicate Customer Detection ---------------------
+def normalize_email(email: str) -> str:
+    """Lower-case an email and drop any +tag from the local part"""
+    local, _, domain = email.strip().lower().partition("@")
+    local = local.split("+", 1)[0]
+    return f"{local}@{domain}" if domain else local
+
+@dataclass
+class MergeProposal:
+    # Customer ids, not rows: rows shift while the proposal waits for review
+    keep: int
+    duplicates: List[int]
+    score: float
+    merged: Customer
+
+def _duplicate_score(a_name: str, b_name: str, a_email: str, b_email: str,
+                     a_phone: str, b_phone: str, threshold: float) -> float:
+    score = 0.0
+    if a_email and a_email == b_email:
+        score += 0.4
+    if a_phone and a_phone == b_phone:
+        score += 0.4
+    if score + 0.4 < threshold:
+        return 0.0
+    name_a, name_b = a_name.lower().strip(), b_name.lower().strip()
+    longest = max(len(name_a), len(name_b), 1)
+    # Largest name distance that can still reach the threshold
+    allowed = int((1.0 - (threshold - score) / 0.4) * longest + 1e-9)
+    distance = edit_distance(name_a, name_b, max(allowed, 0))
+    if distance > allowed:
+        return 0.0
+    return min(score + 0.4 * (1.0 - distance / longest), 1.0)
+
+def find_duplicate_customers(
+    customers: Sequence,
+    threshold: float = 0.75,
+    max_block: int = 200,
+    progress: Optional[Callable[[int, int], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    chunk: int = 2000,
+) -> List[MergeProposal]:
+    """Propose merges for customers that look like the same person.
+
+    Records are bucketed by normalized email and phone, and pairs are only
+    scored inside a bucket, so the job stays near-linear. Buckets larger than
+    max_block (e.g. a shared placeholder email) are skipped. Names are not
+    a bucket: a name alone scores at most 0.4, so a pair needs a shared email
+    or phone to reach any useful threshold.
+
+    Meant to run in a background thread next to the GUI. It works on plain
+    strings and NumPy arrays, so it allocates too few container objects to
+    set off long garbage collections while holding the GIL. Every `chunk`
+    records or comparisons it reports progress, checks for cancellation and
+    sleeps for zero seconds, which lets the GUI thread take the GIL.
+    """
+    total = len(customers)
+
+    def checkpoint(done: int) -> bool:
+        """True when the job should stop"""
+        if progress:
+            progress(done, total * 2)
+        time.sleep(0)
+        return bool(should_cancel and should_cancel())
+
+    # Names are only read for the pairs that get scored
+    names = customers.column("name") if isinstance(customers, RecordTable) else [c.name for c in customers]
+    emails: List[str] = []
+    phones: List[str] = []
+    # Block keys are hashes; the exact comparison happens when scoring
+    keys = np.zeros((2, total), dtype=np.int64)
+    for start in range(0, total, chunk):
+        stop = min(start + chunk, total)
+        if isinstance(customers, RecordTable):
+            emails += customers.column("email")[start:stop]
+            phones += customers.column("phone")[start:stop]
+        else:
+            batch = customers[start:stop]
+            emails += [c.email for c in batch]
+            phones += [c.phone for c in batch]
+        for row in range(start, stop):
+            emails[row] = normalize_email(emails[row])
+            phones[row] = normalize_phone(phones[row])[-10:]
+            for kind, key in enumerate((emails[row], phones[row])):
+                if key:
+                    keys[kind, row] = hash(key) or 1
+        if checkpoint(stop):
+            return []
+    # Group rows by key; a block is a run of equal keys
+    block_rows = np.tile(np.arange(total), 2)
+    keys = keys.ravel()
+    order = np.argsort(keys, kind="stable")
+    keys, block_rows = keys[order], block_rows[order]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(keys)]))
+    sizes = ends - starts
+    wanted = (keys[starts] != 0) & (sizes > 1) & (sizes <= max_block)
+    starts, ends = starts[wanted].tolist(), ends[wanted].tolist()
+    # Union-find over the pairs that clear the threshold
+    parent: Dict[int, int] = {}
+    best: Dict[int, float] = {}
+
+    def find(x: int) -> int:
+        while parent.get(x, x) != x:
+            parent[x] = parent.get(parent[x], parent[x])
+            x = parent[x]
+        return x
+
+    compared = 0
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        rows = block_rows[start:end].tolist()
+        for x in range(len(rows)):
+            a = rows[x]
+            for b in rows[x + 1:]:
+                ra, rb = find(a), find(b)
+                if ra == rb:
+                    continue
+                score = _duplicate_score(names[a], names[b], emails[a], emails[b],
+                                         phones[a], phones[b], threshold)
+                if score >= threshold:
+                    root = min(ra, rb)
+                    parent[max(ra, rb)] = root
+                    best[root] = max(score, best.get(ra, 0.0), best.get(rb, 0.0))
+        compared += len(rows) * (len(rows) - 1) // 2
+        if compared >= chunk:
+            compared = 0
+            if checkpoint(total + ((i + 1) * total) // len(starts)):
+                return []
+    groups: Dict[int, List[int]] = {}
+    for row in sorted(parent):
+        groups.setdefault(find(row), []).append(row)
+    proposals = []
+    for root, rows in groups.items():
+        rows.insert(0, root)
+        records = [customers[r] for r in rows]
+        keep = customers[root]
+        merged = Customer(
+            name=keep.name,
+            phone=keep.phone or next((c.phone for c in records if c.phone), ""),
+            email=keep.email or next((c.email for c in records if c.email), ""),
+            total_purchases=sum(c.total_purchases for c in records),
+            id=keep.id,
+        )
+        proposals.append(MergeProposal(keep=keep.id, duplicates=[c.id for c in records[1:]],
+                                       score=best.get(root, threshold), merged=merged))
+    if progress:
+        progress(total * 2, total * 2)
+    return proposals
+
+class DedupeWorker(QObject):
+    """Runs find_duplicate_customers off the GUI thread.
+
+    The worker's thread is busy inside run(), so a queued cancel() would
+    only arrive once the job is over. Connect cancel with a direct
+    connection; it just sets a thread-safe flag that the job polls.
+    """
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+
+    def __init__(self, customers: RecordTable):
+        super().__init__()
+        # A private copy: the table itself keeps changing under DB sync
+        self.customers = customers.copy()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        proposals = find_duplicate_customers(
+            self.customers,
+            progress=self.progress.emit,
+            should_cancel=self._cancelled.is_set,
+        )
+        self.finished.emit(None if self._cancelled.is_set() else proposals)
+
+# ----------- Leaderboards -------------------------------------
+_SKETCH_PRIME = 2**31 - 1
+
+class WindowedTopK:
+    """Totals per key over sliding day windows, maintained one event at a time.
+
+    Exact mode keeps a Counter per day and one per window; when the newest
+    day moves on, the days that fell out of a window are subtracted from it.
+    Sketch mode (integer keys only) replaces the per-key Counters with
+    Count-Min sketches, which subtract the same way, plus a bounded set of
+    candidate keys per window, so memory no longer grows with cardinality.
+    """
+    def __init__(self, windows: Dict[str, int], sketch: bool = False,
+                 width: int = 8192, depth: int = 4, capacity: int = 256, seed: int = 0):
+        self.windows = windows
+        self.span = max(windows.values())
+        self.sketch = sketch
+        self.as_of: Optional[int] = None
+        self.days: Dict[int, Any] = {}
+        self.totals = {name: 0.0 for name in windows}
+        if sketch:
+            rng = np.random.default_rng(seed)
+            self.width, self.depth, self.capacity = width, depth, capacity
+            self._hash_a = rng.integers(1, _SKETCH_PRIME, depth).reshape(-1, 1)
+            self._hash_b = rng.integers(0, _SKETCH_PRIME, depth).reshape(-1, 1)
+            self.counts = {name: np.zeros((depth, width)) for name in windows}
+            self.candidates: Dict[str, Dict[int, float]] = {name: {} for name in windows}
+        else:
+            self.counts = {name: Counter() for name in windows}
+
+    def _columns(self, keys: np.ndarray) -> np.ndarray:
+        """Sketch column of each key in each row, shape (depth, len(keys))"""
+        keys = np.asarray(keys, dtype=np.int64).reshape(1, -1) % _SKETCH_PRIME
+        return (self._hash_a * keys + self._hash_b) % _SKETCH_PRIME % self.width
+
+    def _estimate(self, name: str, keys: np.ndarray) -> np.ndarray:
+        cols = self._columns(keys)
+        return self.counts[name][np.arange(self.depth).reshape(-1, 1), cols].min(axis=0)
+
+    def _in_window(self, day: int, length: int) -> bool:
+        return day > self.as_of - length
+
+    def _new_bucket(self):
+        return np.zeros((self.depth, self.width)) if self.sketch else Counter()
+
+    def advance(self, day: int):
+        """Move the windows to end on day, expiring days that fell out"""
+        if self.as_of is not None and day <= self.as_of:
+            return
+        previous, self.as_of = self.as_of, day
+        if previous is not None:
+            for name, length in self.windows.items():
+                for d in [d for d in self.days if previous - length < d <= day - length]:
+                    self._subtract(name, d)
+        for d in [d for d in self.days if d <= day - self.span]:
+            del self.days[d]
+        if self.sketch and previous is not None:
+            # Expired days lowered the estimates; rescore so new keys can compete
+            for name in self.windows:
+                self._rescore(name)
+
+    def _rescore(self, name: str):
+        candidates = self.candidates[name]
+        if not candidates:
+            return
+        keys = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        estimates = self._estimate(name, keys)
+        self.candidates[name] = {k: e for k, e in zip(keys.tolist(), estimates.tolist()) if e > 0}
+
+    def _subtract(self, name: str, day: int):
+        bucket = self.days[day]
+        if self.sketch:
+            self.counts[name] -= bucket
+            self.totals[name] -= bucket[0].sum()
+            return
+        counts = self.counts[name]
+        for key, value in bucket.items():
+            left = counts[key] - value
+            if left > 1e-9:
+                counts[key] = left
+            else:
+                del counts[key]
+            self.totals[name] -= value
+
+    def add(self, day: int, key, amount: float):
+        """Count one event"""
+        self.advance(day)
+        if day <= self.as_of - self.span:
+            return
+        bucket = self.days.setdefault(day, self._new_bucket())
+        if self.sketch:
+            cols = self._columns(np.array([key]))[:, 0]
+            bucket[np.arange(self.depth), cols] += amount
+        else:
+            bucket[key] += amount
+        for name, length in self.windows.items():
+            if not self._in_window(day, length):
+                continue
+            self.totals[name] += amount
+            if self.sketch:
+                self.counts[name][np.arange(self.depth), cols] += amount
+                self._offer(name, key, float(self.counts[name][np.arange(self.depth), cols].min()))
+            else:
+                self.counts[name][key] += amount
+
+    def _offer(self, name: str, key: int, estimate: float):
+        """Keep key as a candidate if it beats the weakest one"""
+        candidates = self.candidates[name]
+        if key in candidates or len(candidates) < self.capacity:
+            candidates[key] = estimate
+            return
+        weakest = min(candidates, key=candidates.get)
+        if estimate > candidates[weakest]:
+            del candidates[weakest]
+            candidates[key] = estimate
+
+    def extend(self, day: np.ndarray, keys: np.ndarray, amount: np.ndarray):
+        """Count many events at once, e.g. to start from the sales history"""
+        if not len(day):
+            return
+        self.advance(int(day.max()))
+        recent = day > self.as_of - self.span
+        day, keys, amount = day[recent], keys[recent], amount[recent]
+        for d in np.unique(day).tolist():
+            on_day = day == d
+            unique_keys, inverse = np.unique(keys[on_day], return_inverse=True)
+            sums = np.bincount(inverse, weights=amount[on_day])
+            fresh = self._new_bucket()
+            if self.sketch:
+                cols = self._columns(unique_keys)
+                for row in range(self.depth):
+                    np.add.at(fresh[row], cols[row], sums)
+            else:
+                fresh.update(dict(zip(unique_keys.tolist(), sums.tolist())))
+            targets = [self.days.setdefault(d, self._new_bucket())]
+            targets += [self.counts[name] for name, length in self.windows.items() if self._in_window(d, length)]
+            for target in targets:
+                if self.sketch:
+                    target += fresh
+                else:
+                    target.update(fresh)
+            for name, length in self.windows.items():
+                if self._in_window(d, length):
+                    self.totals[name] += float(sums.sum())
+        if self.sketch:
+            # Offer the keys the sketch ranks highest as candidates
+            for name, length in self.windows.items():
+                window_keys = np.unique(keys[day > self.as_of - length])
+                estimates = self._estimate(name, window_keys)
+                for i in np.argsort(-estimates)[:self.capacity].tolist():
+                    self._offer(name, int(window_keys[i]), float(estimates[i]))
+
+    def top(self, window: str, k: int) -> List[Tuple[Any, float]]:
+        """The k largest (key, total) pairs in a window, largest first"""
+        if not self.sketch:
+            return heapq.nlargest(k, self.counts[window].items(), key=lambda item: item[1])
+        self._rescore(window)
+        return heapq.nlargest(k, self.candidates[window].items(), key=lambda item: item[1])
+
+class Leaderboards:
+    """Top products and brands by units and revenue over sliding day windows"""
+    WINDOWS = {"Today": 1, "7 days": 7, "30 days": 30}
+    METRICS = ("units", "revenue")
+    # Above this many products the product boards switch to sketches
+    SKETCH_PRODUCTS = 200_000
+
+    def __init__(self, sketch: bool = False):
+        self.sketch = sketch
+        self.boards = {
+            (dimension, metric): WindowedTopK(self.WINDOWS, sketch=sketch and dimension == "product")
+            for dimension in ("product", "brand") for metric in self.METRICS
+        }
+
+    @classmethod
+    def from_store(cls, store: ShopStore, sketch: Optional[bool] = None) -> "Leaderboards":
+        products = store.products
+        if sketch is None:
+            sketch = products is not None and len(products) > cls.SKETCH_PRODUCTS
+        boards = cls(sketch)
+        sales = store.sales
+        if sales is None or not len(sales) or products is None:
+            return boards
+        day = np.asarray(sales.column("day"))
+        recent = day > day.max() - max(cls.WINDOWS.values())
+        product_id = np.asarray(sales.column("product_id"))[recent]
+        rows = products.rows_for_ids(product_id)
+        known = rows >= 0
+        day, product_id, rows = day[recent][known], product_id[known], rows[known]
+        units = np.asarray(sales.column("quantity"))[recent][known].astype(np.float64)
+        revenue = units * np.asarray(sales.column("unit_price"))[recent][known]
+        brand = products.array("brand")[rows]
+        for metric, amount in (("units", units), ("revenue", revenue)):
+            boards.boards["product", metric].extend(day, product_id, amount)
+            boards.boards["brand", metric].extend(day, brand, amount)
+        return boards
+
+    def add_sale(self, sale: Sale, brand: str):
+        units = float(sale.quantity)
+        for metric, amount in (("units", units), ("revenue", units * sale.unit_price)):
+            self.boards["product", metric].add(sale.day, sale.product_id, amount)
+            self.boards["brand", metric].add(sale.day, brand.encode("utf-8"), amount)
+
+    def top(self, dimension: str, metric: str, window: str, k: int) -> Tuple[List[Tuple[Any, float]], float]:
+        """(top k entries, total of everything else) for one board"""
+        board = self.boards[dimension, metric]
+        entries = board.top(window, k)
+        if dimension == "brand":
+            entries = [(key.decode("utf-8"), value) for key, value in entries]
+        other = board.totals[window] - sum(value for _, value in entries)
+        return entries, max(other, 0.0)
+
+# ----------- Bulk Product Operations --------------------------
+@dataclass(frozen=True)
+class BulkOperation:
+    """A whole-column price or stock change applied to many products at once.
+
+    Relative changes also carry `sql`, the same change as an SQL expression
+    of the column and one parameter, so with a shared database it is applied
+    to the current values there rather than to this terminal's copy.
+    """
+    name: str
+    field: str
+    apply: Callable[[np.ndarray, float], np.ndarray]
+    takes_value: bool = True
+    sql: Optional[str] = None
+
+def round_to_99(prices: np.ndarray) -> np.ndarray:
+    """Nearest x.99 price point (never below 0.99)"""
+    return np.round(np.maximum(np.round(prices) - 0.01, 0.99), 2)
+
+BULK_OPERATIONS = [
+    BulkOperation("Change price by %", "price", lambda p, v: np.round(np.maximum(p * (1 + v / 100), 0.0), 2),
+                  sql="ROUND(MAX(price * (1 + ? / 100.0), 0.0), 2)"),
+    BulkOperation("Set price", "price", lambda p, v: np.full(p.shape, round(max(v, 0.0), 2))),
+    BulkOperation("Round prices to .99", "price", lambda p, v: round_to_99(p), takes_value=False),
+    BulkOperation("Set stock", "stock", lambda s, v: np.full(s.shape, max(int(v), 0), dtype=np.int64)),
+    BulkOperation("Change stock by", "stock", lambda s, v: np.maximum(s + int(v), 0),
+                  sql="MAX(stock + CAST(? AS INTEGER), 0)"),
+]
+
+# ----------- Purchase History ---------------------------------
+class PurchaseHistory(Sequence):
+    """One customer's orders, newest first, as a view over the sales table"""
+    def __init__(self, sales: RecordTable, rows: np.ndarray):
+        self.sales = sales
+        self.rows = rows
+        quantity = np.asarray(sales.column("quantity"))[rows]
+        self.units = int(quantity.sum())
+        self.revenue = float((quantity * np.asarray(sales.column("unit_price"))[rows]).sum())
+        self.last_day = int(sales.value(int(rows[0]), "day")) if len(rows) else None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        return self.sales[int(self.rows[i])]
+
+    def value(self, i: int, field: str):
+        return self.sales.value(int(self.rows[i]), field)
+
+class PurchaseHistoryIndex:
+    """Sales ordered by (customer_id, day), with an LRU cache of opened histories.
+
+    The index keeps one row permutation plus an offset per customer, so a
+    lookup is a binary search and a slice; no per-customer lists are built.
+    """
+    CACHE_SIZE = 32
+
+    def __init__(self, sales: RecordTable):
+        self.sales = sales
+        self.version = sales.version
+        customer_id = np.asarray(sales.column("customer_id"))
+        day = np.asarray(sales.column("day"))
+        if len(day):
+            # One packed int64 key sorts about twice as fast as a lexsort
+            first, span = day.min(), int(day.max() - day.min()) + 1
+            if int(customer_id.max()) < 2**62 // span and customer_id.min() >= 0:
+                order = np.argsort(customer_id * span + (day - first))
+            else:
+                order = np.lexsort((day, customer_id))
+        else:
+            order = np.zeros(0, dtype=np.int64)
+        self.order = order.astype(np.int32) if len(order) < 2**31 else order
+        grouped = customer_id[order]
+        boundaries = np.flatnonzero(grouped[1:] != grouped[:-1]) + 1
+        self.customer_ids = grouped[np.concatenate(([0], boundaries))] if len(grouped) else grouped
+        self.starts = np.concatenate(([0], boundaries, [len(grouped)])) if len(grouped) else np.zeros(1, dtype=np.int64)
+        self._cache: "OrderedDict[int, PurchaseHistory]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def is_current(self, sales: Optional[RecordTable]) -> bool:
+        return sales is self.sales and sales.version == self.version
+
+    def history(self, customer_id: int) -> PurchaseHistory:
+        cached = self._cache.get(customer_id)
+        if cached is not None:
+            self._cache.move_to_end(customer_id)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        i = int(np.searchsorted(self.customer_ids, customer_id))
+        if i < len(self.customer_ids) and self.customer_ids[i] == customer_id:
+            rows = self.order[self.starts[i]:self.starts[i + 1]][::-1]
+        else:
+            rows = self.order[:0]
+        history = PurchaseHistory(self.sales, rows)
+        self._cache[customer_id] = history
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return history
+
+class FuzzyIndexWorker(QObject):
+    """Builds a FuzzyCustomerIndex off the GUI thread from a private copy of the customers"""
+    finished = pyqtSignal(object)
+
+    def __init__(self, customers: RecordTable):
+        super().__init__()
+        self.customers = customers.copy()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        index = FuzzyCustomerIndex()
+        built = index.build(self.customers, should_cancel=self._cancelled.is_set)
+        self.finished.emit(index if built else None)
+
+class HistoryIndexWorker(QObject):
+    """Builds a PurchaseHistoryIndex off the GUI thread"""
+    finished = pyqtSignal(object)
+
+    def __init__(self, sales: RecordTable):
+        super().__init__()
+        self.sales = sales
+
+    def run(self):
+        self.finished.emit(PurchaseHistoryIndex(self.sales))
+
+# ----------- Shared Widgets and Utilities ----------------------
+def apply_table_profile(table: QTableView, profile: RenderProfile):
+    """Row height and row striping for a data table under a render profile"""
+    header = table.verticalHeader()
+    if table.property("styleRowHeight") is None:
+        table.setProperty("styleRowHeight", header.defaultSectionSize())
+    if profile.row_height:
+        # Fixed, uniform rows: the view never measures row contents
+        header.setMinimumSectionSize(min(profile.row_height, header.minimumSectionSize()))
+        header.setDefaultSectionSize(profile.row_height)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    else:
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setDefaultSectionSize(table.property("styleRowHeight"))
+    table.setWordWrap(profile.row_height is None)
+    table.setAlternatingRowColors(profile.alternating_rows)
+
+class RecordTableModel(QAbstractTableModel):
+    """Read-only table model that formats cells straight from a record sequence.
+
+    Nothing is created per cell; the view only asks for the rows it paints,
+    which keeps large or memory-mapped tables cheap to show. A column's field
+    may also be a callable taking the row, for values derived elsewhere.
+    """
+    def __init__(self, columns: List[Tuple[str, Any, Callable[[Any], str]]], parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.columns = columns
+        self.records: Sequence = []
+        # column -> callable(row) giving the cell's icon or pixmap
+        self.decorations: Dict[int, Callable[[int], Any]] = {}
+
+    def set_records(self, records: Sequence):
+        self.beginResetModel()
+        self.records = records
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def value(self, row: int, field):
+        if callable(field):
+            return field(row)
+        if isinstance(self.records, (RecordTable, RecordRows)):
+            return self.records.value(row, field)
+        return getattr(self.records[row], field)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DecorationRole:
+            decoration = self.decorations.get(index.column())
+            return decoration(index.row()) if decoration else None
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        _, field, fmt = self.columns[index.column()]
+        return fmt(self.value(index.row(), field))
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][0]
+        return None
+
+    def append_record(self, record):
+        self.insert_record(len(self.records), record)
+
+    def insert_record(self, row: int, record):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.records.insert(row, record)
+        self.endInsertRows()
+
+    def replace_record(self, row: int, record):
+        self.records[row] = record
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+    def remove_record(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.records[row]
+        self.endRemoveRows()
+
+    def remove_rows(self, rows: np.ndarray):
+        """Remove many rows, one contiguous block at a time from the bottom up"""
+        rows = np.unique(rows)
+        if not len(rows):
+            return
+        for block in reversed(np.split(rows, np.flatnonzero(np.diff(rows) != 1) + 1)):
+            first, last = int(block[0]), int(block[-1])
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.records[first:last + 1]
+            self.endRemoveRows()
+
+    def refresh_rows(self, first: int, last: int):
+        """One dataChanged for a block of rows updated in place"""
+        self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.columns) - 1))
+
+    def refresh_columns(self, first: int, last: int):
+        """Repaint whole columns whose values changed outside the records"""
+        if self.records:
+            self.dataChanged.emit(self.index(0, first), self.index(len(self.records) - 1, last))
+
+class PurchaseHistoryModel(RecordTableModel):
+    """Orders of one customer, fetched a page at a time as the view scrolls"""
+    PAGE_SIZE = 100
+
+    def __init__(self, columns: List[Tuple[str, Any, Callable[[Any], str]]], parent: Optional[QObject] = None):
+        super().__init__(columns, parent)
+        self.loaded = 0
+
+    def set_records(self, records: Sequence):
+        self.beginResetModel()
+        self.records = records
+        self.loaded = min(self.PAGE_SIZE, len(records))
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not parent.isValid() and self.loaded < len(self.records)
+
+    def fetchMore(self, parent: QModelIndex):
+        count = min(self.PAGE_SIZE, len(self.records) - self.loaded)
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def value(self, row: int, field):
+        if callable(field):
+            return field(row)
+        return self.records.value(row, field)
 
-# ----------- Shared Widgets and Utilities ----------------------
 class Card(QWidget):
     def __init__(self, title: str, subtitle: str = "", parent: Optional[QWidget] = None):
         super().__init__(parent)
@@ -402,6 +2975,14 @@ class Card(QWidget):
         self.subtitle_label.setObjectName("CardSubtitle")
         layout.addWidget(self.title_label)
         layout.addWidget(self.subtitle_label)
+        self.apply_render_profile(render_profiles.get_profile())
+        render_profiles.subscribe(self.apply_render_profile)
+
+    def apply_render_profile(self, profile: RenderProfile):
+        """Attach the card shadow, or drop all graphics effects on the compact profile"""
+        if not profile.graphics_effects:
+            self.setGraphicsEffect(None)
+            return
         # Subtle shadow
         shadow = QGraphicsDropShadowEffect(self)
         shadow.setBlurRadius(22)
@@ -410,6 +2991,97 @@ class Card(QWidget):
         shadow.setEnabled(False) # keep disabled for performance; enable if desired
         self.setGraphicsEffect(shadow)
 
+class DateRangeSelector(QWidget):
+    """Preset ranges, plus start and end sliders over the days with sales"""
+    range_changed = pyqtSignal(int, int)
+    # Preset -> (count, numpy unit) ending on the last day; None for everything
+    PRESETS = {"All time": None, "Last 12 months": (12, "M"), "Last 90 days": (90, "D"), "Last 30 days": (30, "D")}
+    CUSTOM = "Custom"
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItems(list(self.PRESETS) + [self.CUSTOM])
+        self.preset_combo.setCurrentText("Last 12 months")
+        self.start_slider = QSlider(Qt.Orientation.Horizontal)
+        self.end_slider = QSlider(Qt.Orientation.Horizontal)
+        self.range_label = QLabel()
+        self.range_label.setObjectName("CardSubtitle")
+        layout.addWidget(QLabel("Range"))
+        layout.addWidget(self.preset_combo)
+        layout.addWidget(self.start_slider, 1)
+        layout.addWidget(self.end_slider, 1)
+        layout.addWidget(self.range_label)
+        self.first_day = self.last_day = 0
+        self.preset_combo.currentTextChanged.connect(self.on_preset_changed)
+        self.start_slider.valueChanged.connect(self.on_start_moved)
+        self.end_slider.valueChanged.connect(self.on_end_moved)
+        # One more signal on release, so listeners can finish what they skipped mid-drag
+        self.start_slider.sliderReleased.connect(self.on_slider_released)
+        self.end_slider.sliderReleased.connect(self.on_slider_released)
+
+    def dragging(self) -> bool:
+        return self.start_slider.isSliderDown() or self.end_slider.isSliderDown()
+
+    def range(self) -> Tuple[int, int]:
+        """Selected first and last day, inclusive"""
+        return self.first_day + self.start_slider.value(), self.first_day + self.end_slider.value()
+
+    def set_bounds(self, first_day: int, last_day: int):
+        """Days the sliders cover; keeps the preset, or the custom days where they still fit"""
+        start, end = self.range()
+        self.first_day, self.last_day = first_day, last_day
+        for slider in (self.start_slider, self.end_slider):
+            slider.blockSignals(True)
+            slider.setRange(0, last_day - first_day)
+            slider.blockSignals(False)
+        if self.preset_combo.currentText() == self.CUSTOM:
+            self._set_range(start, end)
+        else:
+            self._set_range(*self.preset_range(self.preset_combo.currentText()))
+
+    def preset_range(self, name: str) -> Tuple[int, int]:
+        preset = self.PRESETS[name]
+        if preset is None:
+            return self.first_day, self.last_day
+        count, unit = preset
+        start = np.datetime64(self.last_day, "D").astype(f"datetime64[{unit}]") - (count - 1)
+        return int(start.astype("datetime64[D]").astype(np.int64)), self.last_day
+
+    def _set_range(self, start: int, end: int):
+        """Move both sliders without emitting, then refresh the label"""
+        for slider, day in ((self.start_slider, start), (self.end_slider, end)):
+            slider.blockSignals(True)
+            slider.setValue(day - self.first_day)
+            slider.blockSignals(False)
+        start, end = self.range()
+        self.range_label.setText(f"{np.datetime64(start, 'D')} – {np.datetime64(end, 'D')}")
+
+    def on_preset_changed(self, name: str):
+        if name != self.CUSTOM:
+            self._set_range(*self.preset_range(name))
+            self.range_changed.emit(*self.range())
+
+    def on_start_moved(self, value: int):
+        self._slider_moved(value, max(value, self.end_slider.value()))
+
+    def on_end_moved(self, value: int):
+        self._slider_moved(min(self.start_slider.value(), value), value)
+
+    def on_slider_released(self):
+        self.range_changed.emit(*self.range())
+
+    def _slider_moved(self, start: int, end: int):
+        """Dragging a handle past the other pushes it along, and makes the range custom"""
+        self._set_range(self.first_day + start, self.first_day + end)
+        self.preset_combo.blockSignals(True)
+        self.preset_combo.setCurrentText(self.CUSTOM)
+        self.preset_combo.blockSignals(False)
+        self.range_changed.emit(*self.range())
+
 class FigureCard(QWidget):
     def __init__(self, title: str, parent: Optional[QWidget] = None):
         super().__init__(parent)
@@ -421,12 +3093,49 @@ class FigureCard(QWidget):
         self.title_label.setObjectName("CardTitle")
         outer.addWidget(self.title_label)
         # Matplotlib Figure
-        self.figure = Figure(figsize=(5, 3), tight_layout=True)
+        self.figure = Figure(figsize=(5, 3), dpi=render_profiles.get_profile().chart_dpi)
         self.canvas = FigureCanvasQTAgg(self.figure)
         outer.addWidget(self.canvas)
+        self.live = False
+        self.set_live(False)
         
         # Subscribe to theme changes to update chart styling
         theme_manager.subscribe(self.on_theme_changed)
+        render_profiles.subscribe(self.on_render_profile_changed)
+
+    def set_live(self, live: bool):
+        """While live, redraws keep the last layout instead of fitting it again"""
+        self.live = live
+        lean = render_profiles.get_profile().lean_charts
+        self.figure.set_layout_engine("none" if live or lean else "tight")
+
+    def on_render_profile_changed(self, profile: RenderProfile):
+        """Re-rasterize the chart at the profile's DPI, keeping its on-screen size"""
+        ratio = self.canvas.device_pixel_ratio
+        dpi = profile.chart_dpi * ratio
+        self.figure.set_dpi(dpi)
+        self.figure.set_size_inches(self.canvas.width() * ratio / dpi, self.canvas.height() * ratio / dpi, forward=False)
+        self.set_live(self.live)
+        self.update_chart_theme()
+
+    def apply_render_profile(self):
+        """Under a lean profile, cut the work every draw repeats.
+
+        The tight layout is fitted here, once per content change, instead of
+        on every draw. Numeric axes get at most four ticks, grids are
+        dropped and shapes and labels are drawn without antialiasing.
+        """
+        lean = render_profiles.get_profile().lean_charts
+        for ax in self.figure.axes:
+            for axis in (ax.xaxis, ax.yaxis):
+                if isinstance(axis.get_major_locator(), MaxNLocator):  # not categorical ticks
+                    axis.set_major_locator(MaxNLocator(nbins=4) if lean else AutoLocator())
+            if lean:
+                ax.grid(False)
+            for artist in [*ax.patches, *ax.lines, *ax.texts, *ax.collections, ax.title, ax.xaxis.label, ax.yaxis.label]:
+                artist.set_antialiased(not lean)
+        if lean and not self.live:
+            self.figure.tight_layout()
     
     def on_theme_changed(self, theme: str):
         """Update chart styling when theme changes"""
@@ -463,9 +3172,123 @@ class FigureCard(QWidget):
                 ax.spines['left'].set_color('#e2e8f0')
                 ax.spines['right'].set_color('#e2e8f0')
                 ax.grid(True, alpha=0.3, color='#e2e8f0')
-        
+        self.apply_render_profile()
         self.canvas.draw_idle()
 
+# ----------- Thumbnails ---------------------------------------
+def default_thumbnail_dir() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppLocalDataLocation)
+    return os.path.join(base or os.path.expanduser("~"), "thumbnails")
+
+class _ThumbnailSignals(QObject):
+    loaded = pyqtSignal(object, QImage)
+
+class _ThumbnailTask(QRunnable):
+    """Decode one image at thumbnail size, via the on-disk cache when possible"""
+    def __init__(self, key: Tuple[str, int], cache_dir: Optional[str], signals: _ThumbnailSignals,
+                 wanted: Callable[[Tuple[str, int]], bool]):
+        super().__init__()
+        self.key = key
+        self.cache_dir = cache_dir
+        self.signals = signals
+        self.wanted = wanted
+
+    def run(self):
+        if not self.wanted(self.key):
+            return  # its row scrolled away while the task was queued
+        path, size = self.key
+        image = QImage()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.signals.loaded.emit(self.key, image)
+            return
+        cached = None
+        if self.cache_dir:
+            digest = hashlib.sha1(f"{path}|{stat.st_mtime_ns}|{stat.st_size}|{size}".encode("utf-8")).hexdigest()
+            cached = os.path.join(self.cache_dir, digest + ".png")
+            if os.path.exists(cached):
+                image.load(cached)
+        if image.isNull():
+            reader = QImageReader(path)
+            reader.setAutoTransform(True)
+            if reader.size().isValid():
+                # Decoders like JPEG can then skip most of the full-size pixels
+                reader.setScaledSize(reader.size().scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio))
+            image = reader.read()
+            if not image.isNull() and cached:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                image.save(cached, "PNG")
+        self.signals.loaded.emit(self.key, image)
+
+class ThumbnailCache(QObject):
+    """Product thumbnails decoded on a worker pool and kept in a bounded LRU.
+
+    pixmap() never decodes on the calling thread: a miss queues a task and
+    returns None, and `ready` fires once the thumbnail is in memory. Newer
+    requests run first, so the rows on screen load ahead of rows that were
+    scrolled past. Only the newest `max_queued` requests are kept; older
+    ones are skipped before decoding and reported through `dropped`, as
+    are images that fail to load.
+    """
+    ready = pyqtSignal(str)
+    dropped = pyqtSignal(str)
+
+    def __init__(self, max_pixmaps: int = 512, max_queued: int = 64, max_failed: int = 4096,
+                 cache_dir: Optional[str] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.max_pixmaps = max_pixmaps
+        self.max_queued = max_queued
+        self.max_failed = max_failed
+        self.cache_dir = cache_dir
+        self._pixmaps: "OrderedDict[Tuple[str, int], QPixmap]" = OrderedDict()
+        # Both ordered oldest first; workers read _pending to skip stale tasks
+        self._pending: "OrderedDict[Tuple[str, int], None]" = OrderedDict()
+        self._failed: "OrderedDict[Tuple[str, int], None]" = OrderedDict()
+        self._priority = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, min(4, QThread.idealThreadCount() - 1)))
+        self._signals = _ThumbnailSignals()
+        self._signals.loaded.connect(self._on_loaded)
+
+    def pixmap(self, path: str, size: int) -> Optional[QPixmap]:
+        key = (path, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+        if key in self._pending:
+            self._pending.move_to_end(key)
+        elif key not in self._failed:
+            self._pending[key] = None
+            self._priority += 1
+            self.pool.start(_ThumbnailTask(key, self.cache_dir, self._signals, self._pending.__contains__),
+                            self._priority)
+            if len(self._pending) > self.max_queued:
+                stale, _ = self._pending.popitem(last=False)
+                self.dropped.emit(stale[0])
+        return None
+
+    def is_loading(self, path: str, size: int) -> bool:
+        return (path, size) in self._pending
+
+    def _on_loaded(self, key: Tuple[str, int], image: QImage):
+        self._pending.pop(key, None)
+        if image.isNull():
+            self._failed[key] = None
+            if len(self._failed) > self.max_failed:
+                self._failed.popitem(last=False)
+            self.dropped.emit(key[0])
+            return
+        self._pixmaps[key] = QPixmap.fromImage(image)
+        while len(self._pixmaps) > self.max_pixmaps:
+            self._pixmaps.popitem(last=False)
+        self.ready.emit(key[0])
+
+    def clear(self):
+        self._pixmaps.clear()
+        self._failed.clear()
+
 # ----------- Sidebar ------------------------------------------
 class Sidebar(QFrame):
     menuSelected = pyqtSignal(int)
@@ -536,32 +3359,56 @@ class Sidebar(QFrame):
 
 # ----------- Pages --------------------------------------------
 class DashboardPage(QWidget):
-    def __init__(self, parent: Optional[QWidget] = None):
+    def __init__(self, parent: Optional[QWidget] = None, store: Optional[ShopStore] = None):
         super().__init__(parent)
+        self.store = store or ShopStore()
         outer = QVBoxLayout(self)
         outer.setContentsMargins(16, 16, 16, 16)
         outer.setSpacing(16)
         header = QLabel("Overview")
         header.setObjectName("H1")
         outer.addWidget(header)
+        self.range_label = QLabel("All time")
+        self.range_label.setObjectName("CardSubtitle")
+        outer.addWidget(self.range_label)
         # Cards grid
         cards_row = QHBoxLayout()
         cards_row.setSpacing(16)
         outer.addLayout(cards_row)
-        total_sales = Card("Total Sales", "$124,320")
-        total_sales.setMinimumHeight(100)
-        total_orders = Card("Orders", "2,136")
-        total_orders.setMinimumHeight(100)
-        total_customers = Card("Customers", "856")
-        total_customers.setMinimumHeight(100)
-        cards_row.addWidget(total_sales)
-        cards_row.addWidget(total_orders)
-        cards_row.addWidget(total_customers)
+        self.total_sales = Card("Total Sales", "—")
+        self.total_sales.setMinimumHeight(100)
+        self.total_orders = Card("Orders", "—")
+        self.total_orders.setMinimumHeight(100)
+        self.total_customers = Card("Customers", "—")
+        self.total_customers.setMinimumHeight(100)
+        cards_row.addWidget(self.total_sales)
+        cards_row.addWidget(self.total_orders)
+        cards_row.addWidget(self.total_customers)
         # Scroll filler
         filler = QWidget()
         filler.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         outer.addWidget(filler)
 
+    def showEvent(self, event):
+        self.refresh()
+        super().showEvent(event)
+
+    def refresh(self):
+        """Fill the cards from the shared query cache; only changed tables are re-read"""
+        sums = None if self.store.date_range is None else self.store.prefix_sums()
+        if sums is not None:
+            # Sales KPIs follow the range picked on the Analytics page
+            start, end = self.store.date_range
+            revenue, orders = sums.total("revenue", start, end), int(sums.total("orders", start, end))
+            self.range_label.setText(f"{np.datetime64(start, 'D')} – {np.datetime64(end, 'D')}")
+        else:
+            revenue, orders = self.store.query("sales_totals", ("sales",), lambda: sales_totals(self.store))
+            self.range_label.setText("All time")
+        customers = self.store.customers
+        self.total_sales.subtitle_label.setText(f"${revenue:,.0f}")
+        self.total_orders.subtitle_label.setText(f"{orders:,}")
+        self.total_customers.subtitle_label.setText(f"{0 if customers is None else len(customers):,}")
+
 class ProductDialog(QDialog):
     def __init__(self, parent: Optional[QWidget] = None, product: Optional[Product] = None):
         super().__init__(parent)
@@ -572,6 +3419,8 @@ class ProductDialog(QDialog):
         layout.setSpacing(12)
         form = QFormLayout()
         form.setSpacing(8)
+        self.sku_edit = QLineEdit()
+        self.sku_edit.setPlaceholderText("Scan or type a barcode")
         self.name_edit = QLineEdit()
         self.brand_edit = QLineEdit()
         self.price_edit = QDoubleSpinBox()
@@ -580,21 +3429,39 @@ class ProductDialog(QDialog):
         self.price_edit.setDecimals(2)
         self.stock_edit = QSpinBox()
         self.stock_edit.setMaximum(1_000_000)
+        self.image_edit = QLineEdit()
+        self.image_edit.setPlaceholderText("No photo")
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_image)
+        image_row = QHBoxLayout()
+        image_row.addWidget(self.image_edit, 1)
+        image_row.addWidget(browse_btn)
+        form.addRow("SKU", self.sku_edit)
         form.addRow("Name", self.name_edit)
         form.addRow("Brand", self.brand_edit)
         form.addRow("Price", self.price_edit)
         form.addRow("Stock", self.stock_edit)
+        form.addRow("Photo", image_row)
         layout.addLayout(form)
         buttons = QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel
         self.button_box = QDialogButtonBox(buttons)
         self.button_box.accepted.connect(self.accept)
         self.button_box.rejected.connect(self.reject)
         layout.addWidget(self.button_box)
+        self.product_id = product.id if product else 0
         if product:
+            self.sku_edit.setText(product.sku)
             self.name_edit.setText(product.name)
             self.brand_edit.setText(product.brand)
             self.price_edit.setValue(product.price)
             self.stock_edit.setValue(product.stock)
+            self.image_edit.setText(product.image)
+
+    def browse_image(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Product Photo", self.image_edit.text(),
+                                              "Images (*.png *.jpg *.jpeg *.webp *.bmp *.gif)")
+        if path:
+            self.image_edit.setText(path)
 
     def get_product(self) -> Product:
         return Product(
@@ -602,12 +3469,90 @@ class ProductDialog(QDialog):
             brand=self.brand_edit.text().strip(),
             price=float(self.price_edit.value()),
             stock=int(self.stock_edit.value()),
+            id=self.product_id,
+            sku=self.sku_edit.text().strip(),
+            image=self.image_edit.text().strip(),
         )
 
+class BulkEditDialog(QDialog):
+    """Pick which products to change and how"""
+    SELECTED, BRAND, ALL = "Selected rows", "Brand", "All products"
+
+    def __init__(self, brands: List[str], selected: int, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setWindowTitle("Bulk Edit")
+        self.setObjectName("Dialog")
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(12)
+        form = QFormLayout()
+        form.setSpacing(8)
+        self.scope_combo = QComboBox()
+        if selected:
+            self.scope_combo.addItem(f"{self.SELECTED} ({selected})", self.SELECTED)
+        self.scope_combo.addItem(self.BRAND, self.BRAND)
+        self.scope_combo.addItem(self.ALL, self.ALL)
+        self.brand_combo = QComboBox()
+        self.brand_combo.addItems(brands)
+        self.operation_combo = QComboBox()
+        for operation in BULK_OPERATIONS:
+            self.operation_combo.addItem(operation.name, operation)
+        self.value_edit = QDoubleSpinBox()
+        self.value_edit.setRange(-1_000_000, 1_000_000)
+        self.value_edit.setDecimals(2)
+        form.addRow("Apply to", self.scope_combo)
+        form.addRow("Brand", self.brand_combo)
+        form.addRow("Operation", self.operation_combo)
+        form.addRow("Value", self.value_edit)
+        layout.addLayout(form)
+        buttons = QDialogButtonBox.StandardButton.Apply | QDialogButtonBox.StandardButton.Cancel
+        self.button_box = QDialogButtonBox(buttons)
+        self.button_box.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+        self.scope_combo.currentIndexChanged.connect(self.update_enabled)
+        self.operation_combo.currentIndexChanged.connect(self.update_enabled)
+        self.update_enabled()
+
+    def update_enabled(self):
+        self.brand_combo.setEnabled(self.scope() == self.BRAND)
+        self.value_edit.setEnabled(self.operation().takes_value)
+
+    def scope(self) -> str:
+        return self.scope_combo.currentData()
+
+    def brand(self) -> str:
+        return self.brand_combo.currentText()
+
+    def operation(self) -> BulkOperation:
+        return self.operation_combo.currentData()
+
+    def value(self) -> float:
+        return float(self.value_edit.value())
+
 class ProductsPage(QWidget):
-    def __init__(self, parent: Optional[QWidget] = None):
+    COLUMNS = [
+        ("", "image", lambda v: ""),  # photo thumbnail, drawn as the cell decoration
+        ("SKU", "sku", str),
+        ("Name", "name", str),
+        ("Brand", "brand", str),
+        ("Price", "price", lambda v: f"${v:,.2f}"),
+        ("Stock", "stock", str),
+    ]
+    WALK_IN_CUSTOMER = 0  # customer_id of counter sales made by scanning
+
+    def __init__(self, parent: Optional[QWidget] = None, store: Optional[ShopStore] = None):
         super().__init__(parent)
-        self.products: List[Product] = self.seed_products()
+        self.store = store or ShopStore()
+        if self.store.products is None:
+            self.products = self.seed_products()
+        # Forecast columns are computed from the current stock when painted
+        self.forecast_columns = [
+            ("Demand/Day", self.demand_rate, lambda v: "—" if v is None else f"{v:.1f}"),
+            ("Days of Cover", self.days_of_cover,
+             lambda v: "—" if v is None else ("∞" if v == float("inf") else f"{v:.0f}")),
+            ("Reorder Qty", self.reorder_quantity, lambda v: "—" if v is None else str(v)),
+        ]
         outer = QVBoxLayout(self)
         outer.setContentsMargins(16, 16, 16, 16)
         outer.setSpacing(12)
@@ -620,64 +3565,179 @@ class ProductsPage(QWidget):
         self.add_btn = QPushButton("Add")
         self.edit_btn = QPushButton("Edit")
         self.delete_btn = QPushButton("Delete")
-        for b in (self.add_btn, self.edit_btn, self.delete_btn):
+        self.bulk_btn = QPushButton("Bulk Edit")
+        for b in (self.add_btn, self.edit_btn, self.delete_btn, self.bulk_btn):
             b.setObjectName("PrimaryButton")
             b.setMinimumHeight(34)
         header_row.addWidget(self.add_btn)
         header_row.addWidget(self.edit_btn)
         header_row.addWidget(self.delete_btn)
+        header_row.addWidget(self.bulk_btn)
         outer.addLayout(header_row)
+        # Barcode scanners type the code and press Enter
+        scan_row = QHBoxLayout()
+        scan_row.setSpacing(8)
+        self.scan_edit = QLineEdit()
+        self.scan_edit.setPlaceholderText("Scan or type a SKU and press Enter")
+        self.scan_edit.setClearButtonEnabled(True)
+        self.scan_mode = QComboBox()
+        self.scan_mode.addItems(["Find", "Sell 1", "Edit"])
+        self.scan_mode.setToolTip("What a scan does: jump to the product, take one off its stock, or edit it")
+        self.scan_status = QLabel("")
+        scan_row.addWidget(QLabel("Scan"))
+        scan_row.addWidget(self.scan_edit, 3)
+        scan_row.addWidget(self.scan_mode)
+        scan_row.addWidget(self.scan_status, 2)
+        outer.addLayout(scan_row)
         # Table
-        self.model = QStandardItemModel(0, 4, self)
-        self.model.setHorizontalHeaderLabels(["Name", "Brand", "Price", "Stock"])
+        self.model = RecordTableModel(self.COLUMNS + self.forecast_columns, self)
+        self.thumbnails = ThumbnailCache(cache_dir=default_thumbnail_dir(), parent=self)
+        self.thumbnails.ready.connect(self.on_thumbnail_ready)
+        self.thumbnails.dropped.connect(self.on_thumbnail_dropped)
+        self._thumbnail_waiting: Dict[str, set] = {}
+        self.model.decorations[0] = self.thumbnail
         self.table = QTableView()
         self.table.setObjectName("Table")
         self.table.setModel(self.model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
         self.table.verticalHeader().setVisible(False)
-        self.table.setAlternatingRowColors(True)
+        self.on_render_profile_changed(render_profiles.get_profile())
+        render_profiles.subscribe(self.on_render_profile_changed)
         outer.addWidget(self.table)
         self.refresh_table()
         # Connections
         self.add_btn.clicked.connect(self.add_product)
         self.edit_btn.clicked.connect(self.edit_selected_product)
         self.delete_btn.clicked.connect(self.delete_selected_product)
+        self.bulk_btn.clicked.connect(self.bulk_edit)
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.scan_edit.returnPressed.connect(self.on_scan)
 
-    def seed_products(self) -> List[Product]:
+    def seed_products(self, count: int = 18) -> List[Product]:
         brands = ["Apple", "Samsung", "Xiaomi", "Oppo", "Vivo", "Google"]
+        skus = ean13(200_000_000_000 + np.array(random.sample(range(1_000_000_000), count)))
         sample = []
-        for i in range(18):
+        for i in range(count):
             brand = random.choice(brands)
             name = f"{brand} Model {random.randint(1, 30)}"
             price = round(random.uniform(199, 1499), 2)
             stock = random.randint(0, 250)
-            sample.append(Product(name=name, brand=brand, price=price, stock=stock))
+            sample.append(Product(name=name, brand=brand, price=price, stock=stock, sku=str(skus[i])))
         return sample
 
+    def on_render_profile_changed(self, profile: RenderProfile):
+        apply_table_profile(self.table, profile)
+        size = self.thumbnail_size()
+        self.table.setIconSize(QSize(size, size))
+        self.table.horizontalHeader().resizeSection(0, size + 12)
+
+    def thumbnail_size(self) -> int:
+        """Thumbnails are decoded at the size drawn, so painting never rescales them"""
+        return max(16, self.table.verticalHeader().defaultSectionSize() - 6)
+
+    def thumbnail(self, row: int) -> Optional[QPixmap]:
+        """Decoration for a visible row; a miss queues the decode and repaints on arrival"""
+        path = self.products.value(row, "image")
+        if not path:
+            return None
+        size = self.thumbnail_size()
+        pixmap = self.thumbnails.pixmap(path, size)
+        if pixmap is None and self.thumbnails.is_loading(path, size):
+            self._thumbnail_waiting.setdefault(path, set()).add(self.products.value(row, "id"))
+        return pixmap
+
+    def on_thumbnail_ready(self, path: str):
+        for product_id in self._thumbnail_waiting.pop(path, ()):
+            row = self.products.find(product_id)
+            if row is not None:
+                index = self.model.index(row, 0)
+                self.model.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def on_thumbnail_dropped(self, path: str):
+        # Unreadable, or skipped after scrolling away; a repaint asks again
+        self._thumbnail_waiting.pop(path, None)
+
+    @property
+    def products(self) -> RecordTable:
+        return self.store.products
+
+    @products.setter
+    def products(self, records):
+        self.store.products = records
+
     def refresh_table(self):
-        self.model.setRowCount(0)
-        for p in self.products:
-            self.append_product_to_model(p)
-
-    def append_product_to_model(self, product: Product):
-        row = [
-            QStandardItem(product.name),
-            QStandardItem(product.brand),
-            QStandardItem(f"${product.price:,.2f}"),
-            QStandardItem(str(product.stock)),
-        ]
-        for item in row:
-            item.setEditable(False)
-        self.model.appendRow(row)
+        self.model.set_records(self.products)
 
-    def get_selected_row_index(self) -> Optional[int]:
-        indexes = self.table.selectionModel().selectedRows()
-        if not indexes:
+    def demand_rate(self, row: int) -> Optional[float]:
+        if self.store.forecast is None:
             return None
-        return indexes[0].row()
+        return self.store.forecast.rate_for(self.products.value(row, "id"))
+
+    def days_of_cover(self, row: int) -> Optional[float]:
+        rate = self.demand_rate(row)
+        return None if rate is None else float(DemandForecast.days_of_cover(self.products.value(row, "stock"), rate))
+
+    def reorder_quantity(self, row: int) -> Optional[int]:
+        rate = self.demand_rate(row)
+        return None if rate is None else int(DemandForecast.reorder_quantity(self.products.value(row, "stock"), rate))
+
+    def on_forecast_ready(self):
+        first = len(self.COLUMNS)
+        self.model.refresh_columns(first, first + len(self.forecast_columns) - 1)
+
+    def get_selected_row_index(self) -> Optional[int]:
+        """The selected row when exactly one is selected"""
+        rows = self.selected_rows()
+        return int(rows[0]) if len(rows) == 1 else None
+
+    def on_selection_changed(self, *_):
+        # Edit works on one product; Delete and Bulk Edit take the whole selection
+        single = len(self.selected_rows()) <= 1
+        self.edit_btn.setEnabled(single)
+        self.edit_btn.setToolTip("" if single else "Select a single product to edit")
+
+    def selected_rows(self) -> np.ndarray:
+        """Selected rows, read from the selection ranges rather than per index"""
+        ranges = self.table.selectionModel().selection()
+        if not len(ranges):
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([np.arange(r.top(), r.bottom() + 1) for r in ranges]))
+
+    def bulk_edit(self):
+        brands = [b.decode("utf-8") for b in np.unique(self.products.array("brand")).tolist()]
+        dlg = BulkEditDialog(brands, len(self.selected_rows()), self)
+        if dlg.exec() != QDialog.DialogCode.Accepted:
+            return
+        if dlg.scope() == BulkEditDialog.SELECTED:
+            rows = self.selected_rows()
+        elif dlg.scope() == BulkEditDialog.BRAND:
+            rows = np.flatnonzero(self.products.array("brand") == dlg.brand().encode("utf-8"))
+        else:
+            rows = np.arange(len(self.products))
+        self.apply_bulk(dlg.operation(), rows, dlg.value())
+
+    def apply_bulk(self, operation: BulkOperation, rows: np.ndarray, value: float = 0.0) -> int:
+        """Apply operation to rows as one vectorized write and one view update"""
+        if not len(rows):
+            return 0
+        if operation.sql is not None and self.store.db is not None:
+            # Relative changes run in the database, so a sale or edit made on
+            # another terminal meanwhile is adjusted rather than overwritten
+            rows = self.store.adjust_column("products", rows, operation.field, operation.sql, value)
+        else:
+            current = np.asarray(self.products.column(operation.field))[rows]
+            values = operation.apply(current, value)
+            changed = current != values
+            rows, values = rows[changed], values[changed]
+            if len(rows):
+                self.store.bulk_update("products", rows, operation.field, values)
+        if len(rows):
+            self.model.refresh_rows(int(rows[0]), int(rows[-1]))
+        return len(rows)
 
     def add_product(self):
         dlg = ProductDialog(self)
@@ -686,80 +3746,174 @@ class ProductsPage(QWidget):
             if not product.name or not product.brand:
                 QMessageBox.warning(self, "Invalid", "Name and Brand are required.")
                 return
-            self.products.append(product)
-            self.append_product_to_model(product)
+            if not self.check_sku_free(product):
+                return
+            try:
+                self.model.append_record(self.store.add("products", product))
+            except sqlite3.IntegrityError:
+                self.warn_sku_taken(product.sku)
 
     def edit_selected_product(self):
         row_idx = self.get_selected_row_index()
         if row_idx is None:
-            QMessageBox.information(self, "Select a row", "Please select a product to edit.")
+            QMessageBox.information(self, "Select a row", "Please select a single product to edit.")
             return
+        self.edit_product(row_idx)
+
+    def edit_product(self, row_idx: int):
         current = self.products[row_idx]
         dlg = ProductDialog(self, current)
         if dlg.exec() == QDialog.DialogCode.Accepted:
             edited = dlg.get_product()
+            # Rows may have shifted under DB sync while the dialog was open
+            row_idx = self.products.find(current.id)
+            if row_idx is None:
+                QMessageBox.warning(self, "Product removed", f"'{current.name}' was deleted on another terminal.")
+                return
             if not edited.name or not edited.brand:
                 QMessageBox.warning(self, "Invalid", "Name and Brand are required.")
                 return
-            self.products[row_idx] = edited
-            # Update model row
-            self.model.setItem(row_idx, 0, QStandardItem(edited.name))
-            self.model.setItem(row_idx, 1, QStandardItem(edited.brand))
-            self.model.setItem(row_idx, 2, QStandardItem(f"${edited.price:,.2f}"))
-            self.model.setItem(row_idx, 3, QStandardItem(str(edited.stock)))
-            for c in range(4):
-                self.model.item(row_idx, c).setEditable(False)
+            if not self.check_sku_free(edited):
+                return
+            try:
+                self.store.save("products", edited)
+            except sqlite3.IntegrityError:
+                self.warn_sku_taken(edited.sku)
+                return
+            self.model.replace_record(row_idx, edited)
+
+    def check_sku_free(self, product: Product) -> bool:
+        row = self.store.find_sku(product.sku)
+        if row is not None and self.products.value(row, "id") != product.id:
+            self.warn_sku_taken(product.sku)
+            return False
+        return True
+
+    def warn_sku_taken(self, sku: str):
+        QMessageBox.warning(self, "Duplicate SKU", f"SKU {sku} is already used by another product.")
+
+    def on_scan(self):
+        """Look the scanned SKU up and jump to, sell or edit the product"""
+        sku = self.scan_edit.text().strip()
+        self.scan_edit.clear()
+        if not sku:
+            return
+        row = self.store.find_sku(sku)
+        if row is None:
+            self.scan_status.setText(f"Unknown SKU {sku}")
+            return
+        self.table.selectRow(row)
+        self.table.scrollTo(self.model.index(row, 0))
+        mode = self.scan_mode.currentText()
+        if mode == "Sell 1":
+            self.sell_one(row)
+        elif mode == "Edit":
+            self.edit_product(row)
+        else:
+            self.scan_status.setText(f"{self.products.value(row, 'name')}: {self.products.value(row, 'stock')} in stock")
+
+    def sell_one(self, row: int):
+        name = self.products.value(row, "name")
+        sold, stock = self.store.sell(row, 1, self.WALK_IN_CUSTOMER)
+        self.model.refresh_rows(row, row)
+        if stock is None:
+            self.scan_status.setText(f"{name} was deleted on another terminal")
+        elif not sold:
+            self.scan_status.setText(f"{name} is out of stock")
+        else:
+            self.scan_status.setText(f"Sold 1 × {name}: {stock} left")
 
     def delete_selected_product(self):
-        row_idx = self.get_selected_row_index()
-        if row_idx is None:
+        rows = self.selected_rows()
+        if not len(rows):
             QMessageBox.information(self, "Select a row", "Please select a product to delete.")
             return
-        name = self.products[row_idx].name
-        confirm = QMessageBox.question(self, "Delete", f"Delete product '{name}'?")
-        if confirm == QMessageBox.StandardButton.Yes:
-            del self.products[row_idx]
-            self.model.removeRow(row_idx)
+        ids = np.asarray(self.products.column("id"))[rows]
+        if len(rows) == 1:
+            question = f"Delete product '{self.products.value(int(rows[0]), 'name')}'?"
+        else:
+            question = f"Delete {len(rows):,} selected products?"
+        if QMessageBox.question(self, "Delete", question) != QMessageBox.StandardButton.Yes:
+            return
+        # Rows may have shifted under DB sync while the question was open
+        rows = self.products.rows_for_ids(ids)
+        rows = rows[rows >= 0]
+        with self.store.transaction():
+            for product_id in np.asarray(self.products.column("id"))[rows].tolist():
+                self.store.remove("products", product_id)
+        self.model.remove_rows(rows)
 
-class CustomersFilterProxy(QSortFilterProxyModel):
-    def __init__(self, parent: Optional[QWidget] = None):
+    def apply_remote_changes(self, changes: Dict[int, Optional[Product]]) -> int:
+        """Apply rows changed by another terminal as targeted model updates"""
+        return self.store.apply_changes("products", changes, self.model)
+
+class MergeCustomersDialog(QDialog):
+    def __init__(self, customers: RecordTable, proposals: List[MergeProposal], parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self.search_text = ""
-        self.min_purchases = 0
-
-    def set_search_text(self, text: str):
-        self.search_text = text.lower().strip()
-        self.invalidateFilter()
-
-    def set_min_purchases(self, value: int):
-        self.min_purchases = value
-        self.invalidateFilter()
-
-    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
-        # Columns: Name, Phone, Email, Total Purchases
-        model = self.sourceModel()
-        name_idx = model.index(source_row, 0, source_parent)
-        phone_idx = model.index(source_row, 1, source_parent)
-        email_idx = model.index(source_row, 2, source_parent)
-        total_idx = model.index(source_row, 3, source_parent)
-        name = model.data(name_idx) or ""
-        phone = model.data(phone_idx) or ""
-        email = model.data(email_idx) or ""
-        try:
-            total = int(model.data(total_idx) or 0)
-        except ValueError:
-            total = 0
-        if total < self.min_purchases:
-            return False
-        if not self.search_text:
-            return True
-        blob = f"{name} {phone} {email}".lower()
-        return self.search_text in blob
+        self.setWindowTitle("Merge Duplicate Customers")
+        self.setObjectName("Dialog")
+        self.resize(720, 420)
+        self.proposals = proposals
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(12)
+        layout.addWidget(QLabel(f"{len(proposals)} proposed merges. Uncheck any you want to keep separate."))
+        self.model = QStandardItemModel(0, 4, self)
+        self.model.setHorizontalHeaderLabels(["Keep", "Duplicates", "Merged Purchases", "Score"])
+        for p in proposals:
+            keep_item = QStandardItem(f"{p.merged.name} <{p.merged.email}>")
+            keep_item.setCheckable(True)
+            keep_item.setCheckState(Qt.CheckState.Checked)
+            rows = [customers.find(customer_id) for customer_id in p.duplicates]
+            dupes = ", ".join(f"{customers[r].name} ({customers[r].phone})" for r in rows if r is not None)
+            row = [
+                keep_item,
+                QStandardItem(dupes),
+                QStandardItem(str(p.merged.total_purchases)),
+                QStandardItem(f"{p.score:.2f}"),
+            ]
+            for item in row:
+                item.setEditable(False)
+            self.model.appendRow(row)
+        table = QTableView()
+        table.setObjectName("Table")
+        table.setModel(self.model)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(table)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Merge")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def selected_proposals(self) -> List[MergeProposal]:
+        return [
+            p for row, p in enumerate(self.proposals)
+            if self.model.item(row, 0).checkState() == Qt.CheckState.Checked
+        ]
 
 class CustomersPage(QWidget):
-    def __init__(self, parent: Optional[QWidget] = None):
+    COLUMNS = [
+        ("Name", "name", str),
+        ("Phone", "phone", str),
+        ("Email", "email", str),
+        ("Total Purchases", "total_purchases", str),
+    ]
+
+    def __init__(self, parent: Optional[QWidget] = None, store: Optional[ShopStore] = None):
         super().__init__(parent)
-        self.customers: List[Customer] = self.seed_customers()
+        self.store = store or ShopStore()
+        if self.store.customers is None:
+            self.customers = self.seed_customers()
+        self.history_columns = [
+            ("Date", "day", lambda v: str(np.datetime64(v, "D"))),
+            ("Product", self.history_product_name, str),
+            ("Qty", "quantity", str),
+            ("Unit Price", "unit_price", lambda v: f"${v:,.2f}"),
+            ("Total", self.history_line_total, lambda v: f"${v:,.2f}"),
+        ]
         outer = QVBoxLayout(self)
         outer.setContentsMargins(16, 16, 16, 16)
         outer.setSpacing(12)
@@ -774,38 +3928,87 @@ class CustomersPage(QWidget):
         self.search_edit.setClearButtonEnabled(True)
         filters.addWidget(QLabel("Search"))
         filters.addWidget(self.search_edit, 3)
+        self.fuzzy_check = QCheckBox("Fuzzy")
+        self.fuzzy_check.setToolTip("Typo-tolerant search ranked by relevance")
+        filters.addWidget(self.fuzzy_check)
+        self.match_label = QLabel()
+        self.match_label.setObjectName("CardSubtitle")
+        filters.addWidget(self.match_label)
         self.min_purchases = QSpinBox()
         self.min_purchases.setRange(0, 1_000_000)
         self.min_purchases.setValue(0)
         filters.addWidget(QLabel("Min purchases"))
         filters.addWidget(self.min_purchases, 1)
         filters.addStretch(1)
+        self.dedupe_btn = QPushButton("Find Duplicates")
+        self.dedupe_btn.setObjectName("PrimaryButton")
+        self.dedupe_btn.setMinimumHeight(34)
+        filters.addWidget(self.dedupe_btn)
         outer.addLayout(filters)
-        # Table with proxy
-        self.model = QStandardItemModel(0, 4, self)
-        self.model.setHorizontalHeaderLabels(["Name", "Phone", "Email", "Total Purchases"])
-        self.proxy = CustomersFilterProxy(self)
-        self.proxy.setSourceModel(self.model)
+        # All customers, or the rows matching the filters
+        self.model = RecordTableModel(self.COLUMNS, self)
+        self.match_model = RecordTableModel(self.COLUMNS, self)
+        self.fuzzy_index: Optional[FuzzyCustomerIndex] = None
+        self.fuzzy_thread: Optional[QThread] = None
+        self._fuzzy_backlog: set = set()
+        self._fuzzy_stale = False
+        self._search_blobs: List[str] = []
+        self._search_blobs_version = 0
         self.table = QTableView()
         self.table.setObjectName("Table")
-        self.table.setModel(self.proxy)
+        self.table.setModel(self.model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.table.verticalHeader().setVisible(False)
-        self.table.setAlternatingRowColors(True)
-        outer.addWidget(self.table)
+        # Purchase history of the selected customer
+        self.history_card = QFrame()
+        self.history_card.setObjectName("Card")
+        history_layout = QVBoxLayout(self.history_card)
+        history_layout.setContentsMargins(16, 16, 16, 16)
+        history_layout.setSpacing(6)
+        self.history_title = QLabel("Purchase History")
+        self.history_title.setObjectName("CardTitle")
+        self.history_summary = QLabel("Select a customer to see their orders.")
+        self.history_summary.setObjectName("CardSubtitle")
+        self.history_summary.setWordWrap(True)
+        self.history_model = PurchaseHistoryModel(self.history_columns, self)
+        self.history_table = QTableView()
+        self.history_table.setObjectName("Table")
+        self.history_table.setModel(self.history_model)
+        self.history_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.history_table.horizontalHeader().setStretchLastSection(True)
+        self.history_table.verticalHeader().setVisible(False)
+        history_layout.addWidget(self.history_title)
+        history_layout.addWidget(self.history_summary)
+        history_layout.addWidget(self.history_table)
+        apply_table_profile(self.table, render_profiles.get_profile())
+        apply_table_profile(self.history_table, render_profiles.get_profile())
+        render_profiles.subscribe(self.on_render_profile_changed)
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        splitter.addWidget(self.table)
+        splitter.addWidget(self.history_card)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        outer.addWidget(splitter)
         self.refresh_table()
         # Connect filters
-        self.search_edit.textChanged.connect(self.proxy.set_search_text)
-        self.min_purchases.valueChanged.connect(self.proxy.set_min_purchases)
+        self.search_edit.textChanged.connect(self.update_filters)
+        self.min_purchases.valueChanged.connect(self.update_filters)
+        self.fuzzy_check.toggled.connect(self.update_filters)
+        self.dedupe_btn.clicked.connect(self.find_duplicates)
+        self.table.selectionModel().currentRowChanged.connect(self.on_customer_selected)
+        self.dedupe_thread: Optional[QThread] = None
+        self.history_index: Optional[PurchaseHistoryIndex] = None
+        self.history_thread: Optional[QThread] = None
+        self.selected_customer_id: Optional[int] = None
 
-    def seed_customers(self) -> List[Customer]:
+    def seed_customers(self, count: int = 40) -> List[Customer]:
         first = ["Alex", "Taylor", "Jordan", "Morgan", "Sam", "Riley", "Casey", "Jamie", "Devin", "Avery"]
         last = ["Lee", "Kim", "Patel", "Singh", "Garcia", "Nguyen", "Brown", "Johnson", "Lopez", "Martinez"]
         sample = []
-        for _ in range(40):
+        for _ in range(count):
             name = f"{random.choice(first)} {random.choice(last)}"
             phone = f"+1 {random.randint(200,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}"
             email = f"{name.lower().replace(' ','.')}@example.com"
@@ -813,28 +4016,331 @@ class CustomersPage(QWidget):
             sample.append(Customer(name=name, phone=phone, email=email, total_purchases=total))
         return sample
 
+    def on_render_profile_changed(self, profile: RenderProfile):
+        apply_table_profile(self.table, profile)
+        apply_table_profile(self.history_table, profile)
+
+    @property
+    def customers(self) -> RecordTable:
+        return self.store.customers
+
+    @customers.setter
+    def customers(self, records):
+        self.store.customers = records
+
     def refresh_table(self):
-        self.model.setRowCount(0)
-        for c in self.customers:
-            row = [
-                QStandardItem(c.name),
-                QStandardItem(c.phone),
-                QStandardItem(c.email),
-                QStandardItem(str(c.total_purchases)),
-            ]
-            for item in row:
-                item.setEditable(False)
-            self.model.appendRow(row)
+        self.model.set_records(self.customers)
+        self.fuzzy_index = None
+        self._fuzzy_stale = self.fuzzy_thread is not None
+        self.update_filters()
+
+    def update_filters(self, *_):
+        """Show all customers, or the rows matching the search and purchase filters.
+
+        Matches are gathered in one pass over plain strings (or looked up in
+        the fuzzy index) and shown through a row view, instead of asking a
+        proxy model about every customer cell by cell.
+        """
+        text = self.search_edit.text().strip()
+        minimum = self.min_purchases.value()
+        if not text and not minimum:
+            self.match_label.setText("")
+            self.set_table_model(self.model)
+            return
+        indexing = False
+        if text and self.fuzzy_check.isChecked():
+            self.ensure_fuzzy_index()
+            indexing = self.fuzzy_index is None
+        if indexing:
+            rows = np.empty(0, dtype=np.int64)  # shown once the index is ready
+        elif text and self.fuzzy_check.isChecked():
+            ids = np.array([customer_id for customer_id, _ in self.fuzzy_index.search(text)], dtype=np.int64)
+            rows = self.customers.rows_for_ids(ids)
+            rows = rows[rows >= 0]
+        elif text:
+            needle = text.lower()
+            rows = np.array([row for row, blob in enumerate(self.search_blobs()) if needle in blob], dtype=np.int64)
+        else:
+            rows = np.arange(len(self.customers))
+        if minimum:
+            rows = rows[np.asarray(self.customers.column("total_purchases"))[rows] >= minimum]
+        self.match_model.set_records(RecordRows(self.customers, rows))
+        self.match_label.setText("Indexing customers…" if indexing else f"{len(rows):,} matches")
+        self.set_table_model(self.match_model)
+
+    def search_blobs(self) -> List[str]:
+        """Lower-cased "name phone email" per customer, rebuilt when the table changes"""
+        if self._search_blobs_version != self.customers.version:
+            columns = [self.customers.column(f) for f in ("name", "phone", "email")]
+            self._search_blobs = [f"{name} {phone} {email}".lower() for name, phone, email in zip(*columns)]
+            self._search_blobs_version = self.customers.version
+        return self._search_blobs
+
+    def set_table_model(self, model: QAbstractTableModel):
+        if self.table.model() is model:
+            return
+        old_selection = self.table.selectionModel()
+        self.table.setModel(model)
+        old_selection.deleteLater()
+        self.table.selectionModel().currentRowChanged.connect(self.on_customer_selected)
+        self.on_customer_selected(QModelIndex(), QModelIndex())
+
+    def source_row(self, index: QModelIndex) -> int:
+        """Row in the customer table behind a row of the view"""
+        if index.model() is self.model:
+            return index.row()
+        return int(self.match_model.records.rows[index.row()])
+
+    def on_customer_selected(self, current: QModelIndex, previous: QModelIndex):
+        if current.isValid():
+            row = self.source_row(current)
+            self.selected_customer_id = self.customers.value(row, "id")
+        else:
+            self.selected_customer_id = None
+        self.show_history()
+
+    def show_history(self):
+        """Show the selected customer's orders, loading the history index first if needed"""
+        customer_id = self.selected_customer_id
+        row = None if customer_id is None else self.customers.find(customer_id)
+        if row is None:
+            self.history_title.setText("Purchase History")
+            self.history_summary.setText("Select a customer to see their orders.")
+            self.history_model.set_records([])
+            return
+        self.history_title.setText(f"Purchase History — {self.customers.value(row, 'name')}")
+        sales = self.store.sales
+        if sales is None:
+            self.history_summary.setText("No sales recorded.")
+            self.history_model.set_records([])
+            return
+        if self.history_index is None or not self.history_index.is_current(sales):
+            self.history_summary.setText("Loading purchase history...")
+            self.history_model.set_records([])
+            self.ensure_history_index()
+            return
+        history = self.history_index.history(customer_id)
+        if not len(history):
+            self.history_summary.setText("No orders yet.")
+        else:
+            self.history_summary.setText(
+                f"{len(history):,} orders · {history.units:,} units · ${history.revenue:,.2f} · "
+                f"last on {np.datetime64(history.last_day, 'D')}"
+            )
+        self.history_model.set_records(history)
+
+    def history_product_name(self, row: int) -> str:
+        product_id = self.history_model.value(row, "product_id")
+        products = self.store.products
+        product_row = None if products is None else products.find(product_id)
+        return "(removed product)" if product_row is None else products.value(product_row, "name")
+
+    def history_line_total(self, row: int) -> float:
+        return self.history_model.value(row, "quantity") * self.history_model.value(row, "unit_price")
+
+    def ensure_history_index(self):
+        """Build the (customer, day) sales index in a background thread unless it is current"""
+        sales = self.store.sales
+        if self.history_thread is not None or sales is None:
+            return
+        if self.history_index is not None and self.history_index.is_current(sales):
+            return
+        self.history_thread = QThread(self)
+        self.history_worker = HistoryIndexWorker(sales)
+        self.history_worker.moveToThread(self.history_thread)
+        self.history_thread.started.connect(self.history_worker.run)
+        self.history_worker.finished.connect(self.on_history_index_ready)
+        self.history_thread.start()
+
+    def on_history_index_ready(self, index: PurchaseHistoryIndex):
+        self.history_thread.quit()
+        self.history_thread.wait()
+        self.history_thread = None
+        self.history_worker.deleteLater()
+        self.history_index = index
+        if self.selected_customer_id is not None:
+            self.show_history()
+
+    def ensure_fuzzy_index(self):
+        """Build the fuzzy index in a background thread unless it exists or is being built"""
+        if self.fuzzy_index is not None or self.fuzzy_thread is not None:
+            return
+        self._fuzzy_backlog = set()
+        self._fuzzy_stale = False
+        self.fuzzy_thread = QThread(self)
+        self.fuzzy_worker = FuzzyIndexWorker(self.customers)
+        self.fuzzy_worker.moveToThread(self.fuzzy_thread)
+        self.fuzzy_thread.started.connect(self.fuzzy_worker.run)
+        self.fuzzy_worker.finished.connect(self.on_fuzzy_index_ready)
+        self.fuzzy_thread.start()
+
+    def on_fuzzy_index_ready(self, index: Optional[FuzzyCustomerIndex]):
+        self.fuzzy_thread.quit()
+        self.fuzzy_thread.wait()
+        self.fuzzy_thread = None
+        worker = self.fuzzy_worker
+        worker.deleteLater()
+        if index is None:
+            return
+        if self._fuzzy_stale:
+            # The whole table was replaced while building; start over
+            self.update_filters()
+            return
+        # Catch up with customers changed since the worker took its copy
+        for customer_id in self._fuzzy_backlog:
+            row = worker.customers.find(customer_id)
+            if row is not None:
+                index.remove(worker.customers[row])
+            row = self.customers.find(customer_id)
+            if row is not None:
+                index.add(self.customers[row])
+        self._fuzzy_backlog = set()
+        self.fuzzy_index = index
+        if self.fuzzy_check.isChecked() and self.search_edit.text().strip():
+            self.update_filters()
+
+    def customers_by_id(self, ids) -> Dict[int, Optional[Customer]]:
+        """Current record of each id, None where it is not in the table"""
+        rows = {customer_id: self.customers.find(customer_id) for customer_id in ids}
+        return {customer_id: None if row is None else self.customers[row] for customer_id, row in rows.items()}
+
+    def update_fuzzy_index(self, old: Dict[int, Optional[Customer]]):
+        """Re-index the given customers; old maps each id to its record before the change"""
+        if self.fuzzy_thread is not None:
+            self._fuzzy_backlog.update(old)
+            return
+        if self.fuzzy_index is None:
+            return
+        for customer_id, record in old.items():
+            if record is not None:
+                self.fuzzy_index.remove(record)
+            row = self.customers.find(customer_id)
+            if row is not None:
+                self.fuzzy_index.add(self.customers[row])
+
+    def find_duplicates(self):
+        """Run the dedupe job in a background thread with a progress dialog"""
+        if self.dedupe_thread is not None:
+            return
+        self.dedupe_btn.setEnabled(False)
+        self.dedupe_progress = QProgressDialog("Scanning customers for duplicates...", "Cancel", 0, 100, self)
+        self.dedupe_progress.setWindowTitle("Find Duplicates")
+        self.dedupe_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.dedupe_progress.setMinimumDuration(300)
+        self.dedupe_thread = QThread(self)
+        self.dedupe_worker = DedupeWorker(self.customers)
+        self.dedupe_worker.moveToThread(self.dedupe_thread)
+        self.dedupe_thread.started.connect(self.dedupe_worker.run)
+        self.dedupe_worker.progress.connect(self.on_dedupe_progress)
+        self.dedupe_worker.finished.connect(self.on_dedupe_finished)
+        self.dedupe_progress.canceled.connect(self.dedupe_worker.cancel, Qt.ConnectionType.DirectConnection)
+        self.dedupe_thread.start()
+
+    def on_dedupe_progress(self, done: int, total: int):
+        if total:
+            self.dedupe_progress.setValue(int(done * 100 / total))
+
+    def on_dedupe_finished(self, proposals: Optional[List[MergeProposal]]):
+        self.dedupe_thread.quit()
+        self.dedupe_thread.wait()
+        self.dedupe_thread = None
+        self.dedupe_worker.deleteLater()
+        self.dedupe_progress.reset()
+        self.dedupe_btn.setEnabled(True)
+        if proposals is None:
+            return
+        if not proposals:
+            QMessageBox.information(self, "Find Duplicates", "No duplicate customers found.")
+            return
+        dlg = MergeCustomersDialog(self.customers, proposals, self)
+        if dlg.exec() == QDialog.DialogCode.Accepted:
+            self.apply_merges(dlg.selected_proposals())
+
+    def apply_merges(self, proposals: List[MergeProposal]) -> int:
+        """Merge each proposal whose kept customer still exists; returns how many were applied.
+
+        DB sync keeps running while the dedupe job and the review dialog are
+        open, so every id is looked up again here and missing ones are skipped.
+        """
+        applied = []
+        old = self.customers_by_id({i for p in proposals for i in (p.keep, p.merged.id, *p.duplicates)})
+        with self.store.transaction():
+            for p in proposals:
+                if self.customers.find(p.keep) is None:
+                    continue
+                duplicates = [i for i in p.duplicates if i != p.keep and self.customers.find(i) is not None]
+                self.store.save("customers", p.merged)
+                for customer_id in duplicates:
+                    self.store.remove("customers", customer_id)
+                applied.append((p.merged, duplicates))
+        for merged, duplicates in applied:
+            self.model.replace_record(self.customers.find(merged.id), merged)
+            for customer_id in duplicates:
+                row = self.customers.find(customer_id)
+                if row is not None:
+                    self.model.remove_record(row)
+        if applied:
+            self.update_fuzzy_index(old)
+            self.update_filters()
+        return len(applied)
+
+    def apply_remote_changes(self, changes: Dict[int, Optional[Customer]]) -> int:
+        """Apply rows changed by another terminal as targeted model updates"""
+        old = self.customers_by_id(changes)
+        changed = self.store.apply_changes("customers", changes, self.model)
+        if changed:
+            self.update_fuzzy_index(old)
+            self.update_filters()
+        return changed
 
 class AnalyticsPage(QWidget):
-    def __init__(self, parent: Optional[QWidget] = None):
+    MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    BRANDS = ["Apple", "Samsung", "Xiaomi", "Oppo", "Vivo", "Google"]
+    DEMO_SALES = 3000
+    DEMO_SEED = 0
+    REORDER_BARS = 10
+    BRAND_SLICES = 5
+    PRODUCT_BARS = 10
+    RANGE_WINDOW = "Date range"
+    MONTH_LABELS = 12
+
+    def __init__(self, parent: Optional[QWidget] = None, store: Optional[ShopStore] = None, demo: bool = False):
         super().__init__(parent)
+        self.store = store or ShopStore()
+        if demo and self.store.sales is None and self.store.products is not None \
+                and self.store.customers is not None and len(self.store.products) and len(self.store.customers):
+            # Same demo history every run, for a demo session that is never saved (see --demo)
+            generator = SyntheticDataGenerator(seed=self.DEMO_SEED)
+            self.store.sales = generator.sales(self.DEMO_SALES, self.store.products, self.store.customers)
+            self.store.set_rollups(*sales_rollups(self.store))
+        if self.store.monthly_sales is None:
+            self.store.set_rollups(
+                [random.randint(40, 160) for _ in self.MONTHS],
+                {b: random.randint(5, 30) for b in self.BRANDS},
+            )
         outer = QVBoxLayout(self)
         outer.setContentsMargins(16, 16, 16, 16)
         outer.setSpacing(16)
+        header_row = QHBoxLayout()
+        header_row.setSpacing(8)
         header = QLabel("Analytics")
         header.setObjectName("H1")
-        outer.addWidget(header)
+        header_row.addWidget(header)
+        header_row.addStretch(1)
+        # Leaderboard window and ranking
+        self.window_combo = QComboBox()
+        self.window_combo.addItems([self.RANGE_WINDOW] + list(Leaderboards.WINDOWS))
+        self.window_combo.setCurrentText(self.RANGE_WINDOW)
+        self.metric_combo = QComboBox()
+        self.metric_combo.addItems(["Units", "Revenue"])
+        header_row.addWidget(QLabel("Top sellers over"))
+        header_row.addWidget(self.window_combo)
+        header_row.addWidget(QLabel("by"))
+        header_row.addWidget(self.metric_combo)
+        outer.addLayout(header_row)
+        # Date range for the monthly bars, the "Date range" rankings and the dashboard
+        self.range_selector = DateRangeSelector()
+        outer.addWidget(self.range_selector)
         # Two charts side by side
         charts_row = QHBoxLayout()
         charts_row.setSpacing(16)
@@ -843,43 +4349,235 @@ class AnalyticsPage(QWidget):
         self.brands_card = FigureCard("Best-Selling Brands Share")
         charts_row.addWidget(self.sales_card)
         charts_row.addWidget(self.brands_card)
+        lower_row = QHBoxLayout()
+        lower_row.setSpacing(16)
+        outer.addLayout(lower_row)
+        self.products_card = FigureCard("Top Products")
+        self.reorder_card = FigureCard("Reorder Suggestions")
+        lower_row.addWidget(self.products_card)
+        lower_row.addWidget(self.reorder_card)
         self.render_charts()
         
         # Apply initial theme to charts
         self.sales_card.update_chart_theme()
         self.brands_card.update_chart_theme()
+        self.products_card.update_chart_theme()
+        self.reorder_card.update_chart_theme()
+        render_profiles.subscribe(self.on_render_profile_changed)
+        self.window_combo.currentTextChanged.connect(self.on_leaderboard_changed)
+        self.metric_combo.currentTextChanged.connect(self.on_leaderboard_changed)
+        self.range_selector.range_changed.connect(self.on_range_changed)
+        # Slider moves are folded into one redraw per pass of the event loop
+        self._range_timer = QTimer(self)
+        self._range_timer.setSingleShot(True)
+        self._range_timer.setInterval(0)
+        self._range_timer.timeout.connect(self.render_range)
         
         filler = QWidget()
         filler.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         outer.addWidget(filler)
 
+    def on_render_profile_changed(self, profile: RenderProfile):
+        """Redraw so bar annotations follow the profile's threshold"""
+        self.render_charts()
+        self.sales_card.update_chart_theme()
+        self.brands_card.update_chart_theme()
+        self.products_card.update_chart_theme()
+        self.reorder_card.update_chart_theme()
+
+    def on_leaderboard_changed(self, _text: str):
+        self.render_leaderboards()
+        self.brands_card.update_chart_theme()
+        self.products_card.update_chart_theme()
+
+    def on_range_changed(self, start: int, end: int):
+        self.store.date_range = (start, end)
+        self._range_timer.start()
+
+    def render_range(self):
+        """Redraw the charts that follow the range.
+
+        The totals are prefix-sum lookups, so drawing is the only real cost.
+        While a handle is held the charts skip bar labels and keep their
+        layout. The release redraws them in full.
+        """
+        live = self.range_selector.dragging()
+        cards = [self.sales_card]
+        if self.window_combo.currentText() == self.RANGE_WINDOW:
+            cards += [self.brands_card, self.products_card]
+        for card in cards:
+            card.set_live(live)
+        self.render_monthly_chart(annotate=not live)
+        self.sales_card.update_chart_theme()
+        if len(cards) > 1:
+            self.on_leaderboard_changed(self.RANGE_WINDOW)
+
+    def on_forecast_ready(self):
+        self.render_reorder_chart()
+        self.reorder_card.update_chart_theme()
+
+    def showEvent(self, event):
+        # Cache hits give back the results already drawn, so revisits skip the redraw
+        if self.chart_data() != self._rendered:
+            self.render_charts()
+            self.sales_card.update_chart_theme()
+            self.brands_card.update_chart_theme()
+            self.products_card.update_chart_theme()
+            self.reorder_card.update_chart_theme()
+        super().showEvent(event)
+
+    def chart_data(self) -> Tuple[Any, Optional[Leaderboards], Optional[SalesPrefixSums]]:
+        if self.store.sales is None:
+            return self.store.rollups(), None, None
+        return self.store.rollups(), self.store.leaderboards(), self.store.prefix_sums()
+
     def render_charts(self):
-        # Bar chart for monthly sales
-        months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        sales = [random.randint(40, 160) for _ in months]
-        self.sales_card.figure.clear()
-        ax = self.sales_card.figure.add_subplot(111)
-        bars = ax.bar(months, sales, color="#4F46E5")
-        ax.set_ylabel("Units Sold")
-        ax.set_title("Sales per Month")
-        ax.grid(axis="y", linestyle="--", alpha=0.3)
-        for bar in bars:
-            height = bar.get_height()
-            ax.annotate(f"{height}", (bar.get_x() + bar.get_width() / 2, height),
-                        ha="center", va="bottom", fontsize=8)
+        self._rendered = self.chart_data()
+        self._month_bars = None
+        sums = self._rendered[2]
+        self.range_selector.setVisible(sums is not None)
+        if sums is not None:
+            self.range_selector.set_bounds(sums.first_day, sums.last_day)
+            self.store.date_range = self.range_selector.range()
+        else:
+            self.store.date_range = None
+        self.render_monthly_chart()
+        self.render_leaderboards()
+        self.render_reorder_chart()
+
+    def render_monthly_chart(self, annotate: bool = True):
+        """Units per calendar month across the selected range, or the stored year without a history"""
+        sums = self._rendered[2]
+        if sums is not None:
+            months, sales = sums.monthly("units", *self.store.date_range)
+            month_numbers = months.astype(np.int64) % 12
+            years = months.astype(np.int64) // 12 + 1970
+            if years[0] == years[-1]:
+                labels = [self.MONTHS[m] for m in month_numbers]
+            else:
+                labels = [f"{self.MONTHS[m]} {y % 100:02d}" for m, y in zip(month_numbers, years)]
+            sales = sales.astype(np.int64).tolist()
+        else:
+            labels, sales = self.MONTHS, self._rendered[0][0]
+        bars = self._month_bars
+        if bars is not None and len(bars) == len(sales):
+            # Same months on the axis: move the bars rather than rebuild the figure
+            ax = bars.patches[0].axes if len(bars) else self.sales_card.figure.axes[0]
+            for bar, height in zip(bars, sales):
+                bar.set_height(height)
+            for text in self._month_notes:
+                text.remove()
+            ax.relim()
+            ax.autoscale_view()
+        else:
+            self.sales_card.figure.clear()
+            ax = self.sales_card.figure.add_subplot(111)
+            bars = self._month_bars = ax.bar(range(len(sales)), sales, color="#4F46E5")
+            ax.set_ylabel("Units Sold")
+            ax.set_title("Sales per Month")
+            ax.grid(axis="y", linestyle="--", alpha=0.3)
+        step = -(-len(labels) // self.MONTH_LABELS)
+        ax.set_xticks(range(0, len(labels), step), labels[::step], fontsize=8 if step > 1 else None)
+        self._month_notes = []
+        if annotate and len(bars) <= render_profiles.get_profile().max_bar_annotations:
+            for bar in bars:
+                height = bar.get_height()
+                self._month_notes.append(ax.annotate(f"{height:.0f}", (bar.get_x() + bar.get_width() / 2, height),
+                                                     ha="center", va="bottom", fontsize=8))
         self.sales_card.canvas.draw_idle()
-        # Pie chart for brand share
-        brands = ["Apple", "Samsung", "Xiaomi", "Oppo", "Vivo", "Google"]
-        values = [random.randint(5, 30) for _ in brands]
+
+    def ranking(self, dimension: str, metric: str, k: int) -> Optional[Tuple[List[Tuple[Any, float]], float]]:
+        """(top k, everything else) for the selected window; None without a sales history"""
+        _, boards, sums = self._rendered
+        window = self.window_combo.currentText()
+        if window == self.RANGE_WINDOW:
+            return None if sums is None else sums.top(dimension, metric, *self.store.date_range, k)
+        return None if boards is None else boards.top(dimension, metric, window, k)
+
+    def render_leaderboards(self):
+        """Brand share pie and top products bars for the selected window and metric"""
+        (_, brand_units), _, _ = self._rendered
+        window = self.window_combo.currentText()
+        if window == self.RANGE_WINDOW:
+            window = self.range_selector.range_label.text()
+        metric = self.metric_combo.currentText().lower()
+        brand_ranking = self.ranking("brand", metric, self.BRAND_SLICES)
+        if brand_ranking is not None:
+            brand_top, brand_other = brand_ranking
+        else:
+            # No sales history: fall back to the stored all-time brand units
+            ranked = sorted(brand_units.items(), key=lambda item: item[1], reverse=True)
+            brand_top = ranked[:self.BRAND_SLICES]
+            brand_other = sum(v for _, v in ranked[self.BRAND_SLICES:])
+        # Pie chart for brand share, long tail folded into "Other"
+        brands = [b for b, _ in brand_top] + (["Other"] if brand_other > 0 else [])
+        values = [v for _, v in brand_top] + ([brand_other] if brand_other > 0 else [])
         self.brands_card.figure.clear()
         bx = self.brands_card.figure.add_subplot(111)
-        wedges, texts, autotexts = bx.pie(
-            values, labels=brands, autopct="%1.1f%%", startangle=140, pctdistance=0.8
-        )
-        for w in wedges:
-            w.set_edgecolor("#ffffff")
-        bx.set_aspect("equal")
+        if values:
+            wedges, texts, autotexts = bx.pie(
+                values, labels=brands, autopct="%1.1f%%", startangle=140, pctdistance=0.8
+            )
+            for w in wedges:
+                w.set_edgecolor("#ffffff")
+            bx.set_aspect("equal")
+        else:
+            bx.text(0.5, 0.5, "No sales in this period", ha="center", va="center", transform=bx.transAxes)
+            bx.set_axis_off()
         self.brands_card.canvas.draw_idle()
+        # Horizontal bars for the top products
+        self.products_card.figure.clear()
+        px = self.products_card.figure.add_subplot(111)
+        product_ranking = self.ranking("product", metric, self.PRODUCT_BARS)
+        top, other = product_ranking or ([], 0.0)
+        if not top:
+            px.text(0.5, 0.5, "No sales history" if product_ranking is None else "No sales in this period",
+                    ha="center", va="center", transform=px.transAxes)
+            px.set_axis_off()
+            self.products_card.canvas.draw_idle()
+            return
+        products = self.store.products
+        names = []
+        for product_id, _ in top:
+            row = products.find(product_id)
+            names.append("(removed product)" if row is None else products.value(row, "name"))
+        values = [v for _, v in top]
+        px.barh(range(len(top)), values[::-1], color="#10B981")
+        px.set_yticks(range(len(top)), names[::-1], fontsize=8)
+        px.set_xlabel("Revenue ($)" if metric == "revenue" else "Units")
+        px.set_title(f"Top {len(top)} products: {window} (others: {other:,.0f})", fontsize=9)
+        px.grid(axis="x", linestyle="--", alpha=0.3)
+        self.products_card.canvas.draw_idle()
+
+    def render_reorder_chart(self):
+        """Products needing the largest reorders, labelled with their days of cover"""
+        self.reorder_card.figure.clear()
+        rx = self.reorder_card.figure.add_subplot(111)
+        rx.set_title("Suggested Reorder Quantity")
+        products, forecast = self.store.products, self.store.forecast
+        if forecast is None or products is None or not len(products):
+            rx.text(0.5, 0.5, "Forecast not available", ha="center", va="center", transform=rx.transAxes)
+            rx.set_axis_off()
+            self.reorder_card.canvas.draw_idle()
+            return
+        stock = np.asarray(products.column("stock"))
+        rate = forecast.rates_for(np.asarray(products.column("id")))
+        quantity = DemandForecast.reorder_quantity(stock, rate)
+        top = min(self.REORDER_BARS, len(quantity))
+        rows = np.argpartition(-quantity, top - 1)[:top]
+        rows = rows[np.argsort(-quantity[rows], kind="stable")][::-1]
+        rows = rows[quantity[rows] > 0]
+        names = [products.value(int(r), "name") for r in rows]
+        bars = rx.barh(range(len(rows)), quantity[rows], color="#F59E0B")
+        rx.set_yticks(range(len(rows)), names, fontsize=8)
+        rx.set_xlabel("Units")
+        rx.grid(axis="x", linestyle="--", alpha=0.3)
+        if len(bars) <= render_profiles.get_profile().max_bar_annotations:
+            cover = DemandForecast.days_of_cover(stock[rows], rate[rows])
+            for bar, days in zip(bars, cover):
+                rx.annotate(f"{days:.0f}d cover", (bar.get_width(), bar.get_y() + bar.get_height() / 2),
+                            ha="left", va="center", fontsize=8)
+        self.reorder_card.canvas.draw_idle()
 
 class SettingsPage(QWidget):
     def __init__(self, parent: Optional[QWidget] = None):
@@ -909,12 +4607,18 @@ class SettingsPage(QWidget):
         self.theme_combo.setCurrentText(theme_manager.get_theme().title())
         self.density_combo = QComboBox()
         self.density_combo.addItems(["Comfortable", "Compact"])
+        self.density_combo.setCurrentText(render_profiles.get_profile().name)
+        self.density_combo.setToolTip(
+            "Compact is the low-resource profile: fixed short rows, no striping,\n"
+            "no card effects, fewer chart labels and lower chart resolution"
+        )
         form.addRow("Theme", self.theme_combo)
         form.addRow("Density", self.density_combo)
         form_wrap.addLayout(form)
         
         # Connect theme selection
         self.theme_combo.currentTextChanged.connect(self.on_theme_changed)
+        self.density_combo.currentTextChanged.connect(render_profiles.set_profile)
         
         outer.addWidget(card)
         spacer = QWidget()
@@ -947,8 +4651,22 @@ class SettingsPage(QWidget):
 
 # ----------- Main Window --------------------------------------
 class MainWindow(QMainWindow):
-    def __init__(self):
+    AUTOSAVE_INTERVAL_MS = 60_000
+
+    SYNC_INTERVAL_MS = 1000
+    LOG_PRUNE_INTERVAL_MS = 10 * 60_000
+
+    def __init__(self, store: Optional[ShopStore] = None, snapshot_path: Optional[str] = None,
+                 db: Optional[ShopDatabase] = None, demo: bool = False):
         super().__init__()
+        self.store = store or ShopStore()
+        self.snapshot_path = snapshot_path
+        self.db = db
+        if self.db is not None:
+            self.db.attach(self.store)
+        self._saved_version: Optional[int] = None
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self.forecast_thread: Optional[QThread] = None
         self.setWindowTitle("Mobile Shop Admin Dashboard")
         self.resize(1200, 800)
         # Central layout with splitter for responsive behavior
@@ -966,10 +4684,10 @@ class MainWindow(QMainWindow):
         self.stack = QStackedWidget()
         splitter.addWidget(self.stack)
         # Pages
-        self.dashboard_page = DashboardPage()
-        self.products_page = ProductsPage()
-        self.customers_page = CustomersPage()
-        self.analytics_page = AnalyticsPage()
+        self.dashboard_page = DashboardPage(store=self.store)
+        self.products_page = ProductsPage(store=self.store)
+        self.customers_page = CustomersPage(store=self.store)
+        self.analytics_page = AnalyticsPage(store=self.store, demo=demo)
         self.settings_page = SettingsPage()
         self.stack.addWidget(self.dashboard_page) # 0
         self.stack.addWidget(self.products_page) # 1
@@ -991,6 +4709,97 @@ class MainWindow(QMainWindow):
         # Setup status bar with theme indicator
         self.setup_status_bar()
 
+        # Share data with other terminals through the database
+        if self.db is not None:
+            if self.db.populate(self.store):
+                # Another terminal seeded the database while this one started
+                self.products_page.refresh_table()
+                self.customers_page.refresh_table()
+            self.sync_timer = QTimer(self)
+            self.sync_timer.timeout.connect(self.sync_from_database)
+            self.sync_timer.start(self.SYNC_INTERVAL_MS)
+            self.prune_timer = QTimer(self)
+            self.prune_timer.timeout.connect(self.db.prune_log)
+            self.prune_timer.start(self.LOG_PRUNE_INTERVAL_MS)
+
+        # Keep the warm-start snapshot current in the background
+        if self.snapshot_path:
+            if self.store.is_mapped:
+                self._saved_version = self.store.version
+            self.autosave_timer = QTimer(self)
+            self.autosave_timer.timeout.connect(self.save_snapshot_in_background)
+            self.autosave_timer.start(self.AUTOSAVE_INTERVAL_MS)
+
+        self.run_forecast()
+        self.customers_page.ensure_history_index()
+
+    def run_forecast(self):
+        """Recompute demand forecasts from the sales history in a background thread"""
+        if self.forecast_thread is not None or self.store.sales is None or self.store.products is None:
+            return
+        self.forecast_thread = QThread(self)
+        self.forecast_worker = ForecastWorker(self.store)
+        self.forecast_worker.moveToThread(self.forecast_thread)
+        self.forecast_thread.started.connect(self.forecast_worker.run)
+        self.forecast_worker.finished.connect(self.on_forecast_finished)
+        self.forecast_thread.start()
+
+    def on_forecast_finished(self, forecast: DemandForecast):
+        self.forecast_thread.quit()
+        self.forecast_thread.wait()
+        self.forecast_thread = None
+        self.forecast_worker.deleteLater()
+        self.store.forecast = forecast
+        self.products_page.on_forecast_ready()
+        self.analytics_page.on_forecast_ready()
+
+    def sync_from_database(self):
+        """Pull rows other terminals changed and patch them into the views"""
+        if not self.db.has_external_changes():
+            return
+        changes = self.db.pull_changes(self.store)
+        changed = self.products_page.apply_remote_changes(changes["products"])
+        changed += self.customers_page.apply_remote_changes(changes["customers"])
+        if changed:
+            self.statusBar().showMessage(f"Synced {changed} change(s) from another terminal", 5000)
+
+    def save_snapshot_in_background(self):
+        """Write a snapshot on a worker thread if the data changed since the last one"""
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+        version = self.store.version
+        if version == self._saved_version:
+            return
+        payload = self.store.snapshot_payload()
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot, args=(payload, version), name="snapshot-writer", daemon=True
+        )
+        self._snapshot_thread.start()
+
+    def _write_snapshot(self, payload: Dict[str, Any], version: int):
+        try:
+            ShopStore.write_snapshot(payload, self.snapshot_path, self.store.mapped_path)
+            self._saved_version = version
+        except OSError as exc:
+            print(f"Could not write snapshot {self.snapshot_path}: {exc}", file=sys.stderr)
+
+    def closeEvent(self, event):
+        if self.customers_page.fuzzy_thread is not None:
+            self.customers_page.fuzzy_worker.cancel()
+        for thread in (self.forecast_thread, self.customers_page.history_thread, self.customers_page.fuzzy_thread):
+            if thread is not None:
+                thread.quit()
+                thread.wait()
+        if self.snapshot_path:
+            # Let a running save finish, then write whatever changed since
+            # and wait for that too: the writer is a daemon thread
+            if self._snapshot_thread is not None:
+                self._snapshot_thread.join()
+            self.save_snapshot_in_background()
+            if self._snapshot_thread is not None:
+                self._snapshot_thread.join()
+        super().closeEvent(event)
+
     def setup_menu(self):
         bar = self.menuBar()
         file_menu = bar.addMenu("File")
@@ -1009,6 +4818,22 @@ class MainWindow(QMainWindow):
         theme_action.setToolTip("Switch between light and dark themes")
         view_menu.addAction(theme_action)
 
+        cache_action = QAction("Query Cache Statistics", self)
+        cache_action.triggered.connect(self.show_cache_stats)
+        view_menu.addAction(cache_action)
+
+    def show_cache_stats(self):
+        stats = self.store.cache.stats()
+        QMessageBox.information(
+            self, "Query Cache",
+            f"Entries: {stats['entries']}\n"
+            f"Hits: {stats['hits']}\n"
+            f"Misses: {stats['misses']}\n"
+            f"Invalidated by writes: {stats['invalidations']}\n"
+            f"Evicted: {stats['evictions']}\n"
+            f"Hit rate: {stats['hit_rate']:.0%}",
+        )
+
     def setup_status_bar(self):
         """Setup status bar with theme indicator"""
         self.statusBar().showMessage("Ready")
@@ -1035,11 +4860,213 @@ class MainWindow(QMainWindow):
         """Apply the selected theme to the application"""
         self.setStyleSheet(theme_manager.get_stylesheet())
 
+# ----------- Memory Diagnostics -------------------------------
+def current_rss() -> int:
+    """Resident set size of this process in bytes (0 if unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss()
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes (0 if unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def measure_page_memory(page_factory: Callable[[], QWidget], load: Callable[[QWidget], None], rows: int) -> Dict[str, float]:
+    """Build a page, load rows into it and report how much memory that took"""
+    page = page_factory()
+    gc.collect()
+    rss_before = current_rss()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    py_before, _ = tracemalloc.get_traced_memory()
+    load(page)
+    QApplication.processEvents()
+    py_after, py_peak = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+    py_current = max(py_after - py_before, 0)
+    gc.collect()
+    rss_delta = max(current_rss() - rss_before, 0)
+    page.deleteLater()
+    return {
+        "rows": rows,
+        "rss_delta": rss_delta,
+        "bytes_per_row": rss_delta / max(rows, 1),
+        "python_bytes_per_row": py_current / max(rows, 1),
+        "python_peak": py_peak,
+    }
+
+def run_memory_benchmark(rows: int, max_bytes_per_row: Optional[float] = None, seed: int = 0) -> int:
+    """Load N generated products and customers into their pages and print the cost per row.
+
+    Returns a non-zero exit code when max_bytes_per_row is exceeded so the
+    benchmark can gate regressions.
+    """
+    generator = SyntheticDataGenerator(seed)
+
+    # Search structures are built on first use, so use each once to count them
+    def load_products(page: ProductsPage):
+        page.products = generator.products(rows)
+        page.refresh_table()
+        page.scan_edit.setText(page.products.value(rows // 2, "sku"))  # SKU hash index
+        page.on_scan()
+
+    def load_customers(page: CustomersPage):
+        page.customers = generator.customers(rows)
+        page.refresh_table()
+        page.search_edit.setText("lee")  # plain search blobs
+        page.fuzzy_check.setChecked(True)  # fuzzy index, built in the background
+        while page.fuzzy_index is None:
+            QApplication.processEvents()
+            time.sleep(0.01)
+        page.search_edit.clear()
+        page.fuzzy_check.setChecked(False)
+
+    results = {
+        "ProductsPage": measure_page_memory(ProductsPage, load_products, rows),
+        "CustomersPage": measure_page_memory(CustomersPage, load_customers, rows),
+    }
+    print(f"Memory benchmark: {rows:,} rows per page")
+    print(f"{'Page':<16}{'RSS delta':>14}{'bytes/row':>12}{'py bytes/row':>14}{'py peak':>14}")
+    failed = False
+    for name, r in results.items():
+        print(f"{name:<16}{r['rss_delta'] / 2**20:>11.1f} MB{r['bytes_per_row']:>12,.0f}"
+              f"{r['python_bytes_per_row']:>14,.0f}{r['python_peak'] / 2**20:>11.1f} MB")
+        if max_bytes_per_row is not None and r["bytes_per_row"] > max_bytes_per_row:
+            failed = True
+    print(f"Peak RSS: {peak_rss() / 2**20:.1f} MB")
+    if failed:
+        print(f"FAIL: more than {max_bytes_per_row:,.0f} bytes per row")
+        return 1
+    return 0
+
+def print_memory_report(limit: int = 15):
+    """Print the top tracemalloc allocation sites"""
+    if not tracemalloc.is_tracing():
+        return
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+    stats = snapshot.statistics("lineno")
+    current, peak = tracemalloc.get_traced_memory()
+    print(f"Python heap: {current / 2**20:.1f} MB current, {peak / 2**20:.1f} MB peak; "
+          f"peak RSS {peak_rss() / 2**20:.1f} MB")
+    print(f"Top {limit} allocation sites:")
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        print(f"{stat.size / 1024:>10.1f} KiB {stat.count:>8} blocks  {frame.filename}:{frame.lineno}")
+
+# ----------- Frame Timing -------------------------------------
+def measure_frame_times(widget: QWidget, frames: int) -> List[float]:
+    """Fully repaint widget (re-rendering any charts) frames times; returns ms per frame"""
+    cards = widget.findChildren(FigureCard)
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        for card in cards:
+            card.canvas.draw()
+        widget.grab()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def run_frame_benchmark(window: "MainWindow", frames: int) -> int:
+    """Print mean and p95 frame time of every page under each render profile"""
+    window.show()
+    original = render_profiles.get_profile().name
+    print(f"Frame benchmark: {frames} frames per page")
+    print(f"{'Profile':<14}{'Page':<16}{'mean ms':>10}{'p95 ms':>10}")
+    for profile in (RenderProfileManager.COMFORTABLE, RenderProfileManager.COMPACT):
+        render_profiles.set_profile(profile.name)
+        for index in range(window.stack.count()):
+            window.stack.setCurrentIndex(index)
+            page = window.stack.widget(index)
+            QApplication.processEvents()
+            measure_frame_times(page, 2)  # warm caches
+            times = sorted(measure_frame_times(page, frames))
+            p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+            print(f"{profile.name:<14}{type(page).__name__:<16}{sum(times) / len(times):>10.2f}{p95:>10.2f}")
+    render_profiles.set_profile(original)
+    return 0
+
 # ----------- App bootstrap ------------------------------------
+def parse_args(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    """Parse our own options and leave the rest for Qt"""
+    parser = argparse.ArgumentParser(description="Mobile Shop Admin Dashboard")
+    parser.add_argument("--snapshot", metavar="PATH",
+                        help="warm-start snapshot file (default: in the app data folder)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="start from fresh data and do not write a snapshot")
+    parser.add_argument("--db", metavar="PATH",
+                        help="SQLite file shared with other terminals; changes are synced live")
+    parser.add_argument("--generate", nargs=3, type=int, metavar=("PRODUCTS", "CUSTOMERS", "SALES"),
+                        help="start with generated data instead of the saved snapshot")
+    parser.add_argument("--generate-out", metavar="PATH",
+                        help="with --generate, write the data to a snapshot file and exit")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for generated data (default: 0)")
+    parser.add_argument("--brand-skew", type=float, metavar="S",
+                        help="with --generate, Zipf exponent of brand popularity (default: 1.1)")
+    parser.add_argument("--seasonality", type=float, metavar="A",
+                        help="with --generate, amplitude of the yearly demand cycle, 0 = flat (default: 0.35)")
+    parser.add_argument("--demo", action="store_true",
+                        help="show the seeded catalogue with a fixed demo sales history; nothing is saved")
+    parser.add_argument("--frame-bench", type=int, metavar="FRAMES",
+                        help="time FRAMES full repaints of each page under each density profile and exit")
+    parser.add_argument("--memory-report", nargs="?", const=15, type=int, metavar="N",
+                        help="trace allocations and print the top N sites on exit")
+    parser.add_argument("--memory-bench", type=int, metavar="ROWS",
+                        help="load ROWS products and customers, report memory per row and exit")
+    parser.add_argument("--max-bytes-per-row", type=float, metavar="BYTES",
+                        help="with --memory-bench, exit non-zero above this many bytes per row")
+    args, qt_args = parser.parse_known_args(argv[1:])
+    if not args.generate:
+        for flag in ("generate_out", "brand_skew", "seasonality"):
+            if getattr(args, flag) is not None:
+                parser.error(f"--{flag.replace('_', '-')} requires --generate")
+    if args.demo and (args.generate or args.db or args.snapshot):
+        parser.error("--demo cannot be combined with --generate, --db or --snapshot")
+    return args, qt_args
+
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv)
+    if args.memory_report:
+        tracemalloc.start()
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.setApplicationName("MobileShopDashboard")
     app.setStyle("Fusion")
-    window = MainWindow()
+    if args.memory_bench:
+        sys.exit(run_memory_benchmark(args.memory_bench, args.max_bytes_per_row, args.seed))
+    if args.generate:
+        shape = {k: v for k, v in (("brand_skew", args.brand_skew), ("seasonality", args.seasonality)) if v is not None}
+        store = SyntheticDataGenerator(args.seed, **shape).generate(*args.generate)
+        if args.generate_out:
+            store.save_snapshot(args.generate_out)
+            sys.exit(0)
+    if args.memory_report:
+        app.aboutToQuit.connect(lambda: print_memory_report(args.memory_report))
+    snapshot_path = None if args.no_snapshot else (args.snapshot or default_snapshot_path())
+    if args.frame_bench:
+        window = MainWindow(store if args.generate else ShopStore(), demo=True)
+        sys.exit(run_frame_benchmark(window, args.frame_bench))
+    db = ShopDatabase(args.db) if args.db else None
+    if args.demo:
+        window = MainWindow(ShopStore(), demo=True)
+    elif args.generate:
+        # Generated data only replaces a snapshot the user named explicitly
+        window = MainWindow(store, args.snapshot if not args.no_snapshot else None, db)
+    else:
+        window = MainWindow(ShopStore.open(snapshot_path), snapshot_path, db)
     window.show()
     sys.exit(app.exec())
 
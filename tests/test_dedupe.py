@@ -0,0 +1,53 @@
+"""Duplicate customer detection, checked against scoring every pair"""
+import itertools
+
+import pytest
+
+from ai01 import Customer, _duplicate_score, find_duplicate_customers, normalize_email, normalize_phone
+
+
+def customer(id, name, phone="", email=""):
+    return Customer(name=name, phone=phone, email=email, total_purchases=1, id=id)
+
+
+@pytest.fixture
+def customers():
+    return [
+        customer(1, "Maria Lopez", "+1 212-555-0101", "maria.lopez@example.com"),
+        customer(2, "Maria Lopes", "(212) 555 0101", "m.lopez@work.example"),        # same phone, typo
+        customer(3, "Maria Lopez", "+1 646-555-0199", "MARIA.LOPEZ+shop@example.com"),  # same email
+        customer(4, "Maria Lopez", "+1 718-555-0123", "other.maria@example.com"),     # name only
+        customer(5, "Devin Chen", "+1 917-555-0144", "devin@example.com"),
+        customer(6, "Alex Kim", "+1 917-555-0144", "alex.kim@example.com"),          # phone only
+    ]
+
+
+def brute_force_pairs(customers, threshold=0.75):
+    pairs = set()
+    for a, b in itertools.combinations(customers, 2):
+        score = _duplicate_score(a.name, b.name, normalize_email(a.email), normalize_email(b.email),
+                                 normalize_phone(a.phone)[-10:], normalize_phone(b.phone)[-10:], threshold)
+        if score >= threshold:
+            pairs.add((a.id, b.id))
+    return pairs
+
+
+def proposed_pairs(proposals):
+    pairs = set()
+    for p in proposals:
+        ids = sorted([p.keep, *p.duplicates])
+        pairs.update(itertools.combinations(ids, 2))
+    return pairs
+
+
+def test_shared_email_or_phone_with_similar_name_is_proposed(customers):
+    proposals = find_duplicate_customers(customers)
+    assert [(p.keep, sorted(p.duplicates)) for p in proposals] == [(1, [2, 3])]
+
+
+def test_same_name_alone_is_not_a_duplicate(customers):
+    assert all(4 not in (p.keep, *p.duplicates) for p in find_duplicate_customers(customers))
+
+
+def test_blocking_finds_every_pair_that_scores_above_threshold(customers):
+    assert brute_force_pairs(customers) <= proposed_pairs(find_duplicate_customers(customers))
@@ -0,0 +1,49 @@
+"""Recall of the fuzzy customer search, checked against brute-force scans"""
+import pytest
+
+from ai01 import Customer, FuzzyCustomerIndex, SyntheticDataGenerator, normalize_phone
+
+
+@pytest.fixture(scope="module")
+def customers():
+    return SyntheticDataGenerator(seed=3).generate(10, 50_000, 0).customers
+
+
+@pytest.fixture(scope="module")
+def index(customers):
+    index = FuzzyCustomerIndex()
+    index.build(customers)
+    return index
+
+
+@pytest.mark.parametrize("query", ["555", "5551", "2058", "98790"])
+def test_phone_digits_find_every_substring_match(customers, index, query):
+    ids = customers.column("id")
+    expected = {int(ids[row]) for row, phone in enumerate(customers.column("phone")) if query in normalize_phone(phone)}
+    found = {customer_id for customer_id, _ in index.search(query)}
+    assert expected
+    assert expected <= found
+
+
+@pytest.mark.parametrize("query", ["dev", "devin", "lopez", "taylr"])
+def test_name_words_find_every_close_match(customers, index, query):
+    words = {word for name in customers.column("name") for word in name.lower().split()}
+    close = {word for word in words if index._term_similarity(query, word) >= FuzzyCustomerIndex.MIN_SIMILARITY}
+    ids = customers.column("id")
+    expected = {int(ids[row]) for row, name in enumerate(customers.column("name")) if close & set(name.lower().split())}
+    found = {customer_id for customer_id, _ in index.search(query)}
+    assert expected
+    assert expected <= found
+
+
+def test_add_and_remove_update_only_that_customer():
+    index = FuzzyCustomerIndex()
+    old = Customer(id=7, name="Alex Quill", phone="+1 212-555-0101", email="aq@example.com", total_purchases=0)
+    other = Customer(id=8, name="Alex Quill", phone="+1 646-555-0199", email="alex@example.com", total_purchases=0)
+    index.add(old)
+    index.add(other)
+    new = Customer(id=7, name="Alex Brandt", phone="+1 212-555-0101", email="aq@example.com", total_purchases=0)
+    index.remove(old)
+    index.add(new)
+    assert {customer_id for customer_id, _ in index.search("quill")} == {8}
+    assert 7 in {customer_id for customer_id, _ in index.search("brandt")}
@@ -0,0 +1,54 @@
+"""Incrementally maintained sales analytics, checked against a full rebuild"""
+import numpy as np
+import pytest
+
+from ai01 import Sale, SalesPrefixSums, SyntheticDataGenerator, sales_rollups
+
+
+@pytest.fixture
+def store():
+    return SyntheticDataGenerator(seed=5).generate(200, 500, 20_000)
+
+
+def assert_same_sums(sums, rebuilt):
+    assert (sums.first_day, sums.last_day, sums.span) == (rebuilt.first_day, rebuilt.last_day, rebuilt.span)
+    np.testing.assert_array_equal(sums.day_starts, rebuilt.day_starts)
+    np.testing.assert_array_equal(sums.month_starts, rebuilt.month_starts)
+    for metric in SalesPrefixSums.METRICS:
+        np.testing.assert_allclose(sums.totals[metric], rebuilt.totals[metric])
+        np.testing.assert_allclose(sums.brand_sums[metric], rebuilt.brand_sums[metric])
+        np.testing.assert_allclose(sums.product_months[metric], rebuilt.product_months[metric])
+        for start, end in [(sums.first_day, sums.last_day), (sums.last_day - 40, sums.last_day)]:
+            np.testing.assert_allclose(sums.product_totals(metric, start, end),
+                                       rebuilt.product_totals(metric, start, end))
+
+
+def test_recorded_sales_extend_the_sums_in_place(store):
+    sums = store.prefix_sums()
+    last = sums.last_day
+    product_id = int(store.products.value(3, "id"))
+    for day in (last, last, last + 1, last + 45, last + 45):
+        store.record_sale(Sale(day=day, product_id=product_id, customer_id=1, quantity=2, unit_price=9.5))
+    store.record_sale(Sale(day=last + 45, product_id=10**9, customer_id=1, quantity=1, unit_price=1.0))
+    assert store.prefix_sums() is sums
+    assert_same_sums(sums, SalesPrefixSums(store))
+    assert store.rollups() == sales_rollups(store)
+
+
+def test_stock_and_price_edits_keep_the_sums(store):
+    sums = store.prefix_sums()
+    store.products.set_values(np.arange(10), "stock", 0)
+    product = store.products[0]
+    product.price += 1
+    store.products[0] = product
+    assert store.prefix_sums() is sums
+    product.brand = "Nokia"
+    store.products[0] = product
+    assert store.prefix_sums() is not sums
+
+
+def test_backdated_sale_rebuilds_the_sums(store):
+    sums = store.prefix_sums()
+    product_id = int(store.products.value(0, "id"))
+    store.record_sale(Sale(day=sums.first_day, product_id=product_id, customer_id=1, quantity=1, unit_price=5.0))
+    assert store.prefix_sums() is not sums
@@ -0,0 +1,34 @@
+"""Snapshot payloads share column data copy-on-write with the live tables"""
+import numpy as np
+
+from ai01 import Sale, ShopStore, SyntheticDataGenerator
+
+
+def test_payload_is_unaffected_by_later_edits(tmp_path):
+    store = SyntheticDataGenerator(seed=2).generate(50, 80, 2_000)
+    stock = np.array(store.products.column("stock"))
+    sales = len(store.sales)
+    payload = store.snapshot_payload()
+    assert payload["tables"]["products"]["stock"] is store.products.column("stock")
+    store.products.set_values(np.arange(10), "stock", 12345)
+    product = store.products[20]
+    product.stock = 54321
+    store.products[20] = product
+    store.record_sale(Sale(day=int(store.sales.value(0, "day")), product_id=1, customer_id=1, quantity=1, unit_price=1.0))
+    path = str(tmp_path / "shop.snap")
+    ShopStore.write_snapshot(payload, path)
+    saved = ShopStore.open(path)
+    np.testing.assert_array_equal(saved.products.column("stock"), stock)
+    assert len(saved.sales) == sales
+    assert store.products.value(0, "stock") == 12345 and store.products.value(20, "stock") == 54321
+
+
+def test_payload_shares_mapped_columns(tmp_path):
+    path = str(tmp_path / "shop.snap")
+    SyntheticDataGenerator(seed=2).generate(50, 80, 2_000).save_snapshot(path)
+    store = ShopStore.open(path)
+    payload = store.snapshot_payload()
+    for name, columns in payload["tables"].items():
+        for field, column in columns.items():
+            if isinstance(column, np.ndarray):
+                assert column is store.table(name).column(field)